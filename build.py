@@ -3,6 +3,8 @@
 # Redistribution of modified versions is not permitted.
 
 import argparse
+import functools
+import glob
 import importlib.metadata
 import importlib.util
 import json
@@ -40,6 +42,29 @@ CFLAGS_OLD = os.environ.get("CFLAGS", "")
 CXXFLAGS_OLD = os.environ.get("CFLAGS", "")
 LDFLAGS_OLD = os.environ.get("CFLAGS", "")
 
+SOUNDCARD_OLE32_PATTERN = re.compile(r"^([ \t]*)_ole32\.CoUninitialize\(\).*$", re.M)
+SOUNDCARD_OLE32_REPLACEMENT = r"\1if _ole32: _ole32.CoUninitialize()"
+SOUNDCARD_PULSE_PATTERN = re.compile(r"^([ \t]*)assert self\._pa_context_get_state.*$", re.M)
+SOUNDCARD_PULSE_REPLACEMENT = (
+    r"\1if self._pa_context_get_state(self.context) != _pa.PA_CONTEXT_READY:" "\n"
+    r'\1    raise RuntimeError("PulseAudio context not ready (no sound system?)")'
+)
+
+CYTHON_SKIP_PATTERN = re.compile(r"Cythonizing|Compiling|creating|  warn\(|build_ext")
+
+NUMPY_BLAS_CHECK = "import numpy; print(int(numpy.__config__.show_config('dicts')['Build Dependencies']['blas'].get('found', False)))"
+
+EXTENSIONS_FLAG_PATTERN = re.compile(rb"^ENABLE_EXTENSIONS = (True|False)\b", re.M)
+
+CURSES_IMPORT = b"import curses"
+PGCURSES_IMPORT = b"from endcord import pgcurses as curses"
+CURSES_IMPORT_PATTERN = re.compile(rb"^(import curses|from endcord import pgcurses as curses)\b[^\r\n]*", re.M)
+
+NUMPY_LITE_MARKER = os.path.join(".venv", ".numpy-lite-built")
+
+SOURCE_DIRS = ("endcord", "endcord_cython")
+SKIP_DIRS = ("__pycache__", "build", "dist", "node_modules")
+
 RED = "\033[1;31m"
 PURPLE = "\033[1;35m"
 
@@ -48,54 +73,54 @@ if sys.platform.startswith("android"):
 if "bsd" in sys.platform:
     sys.platform = "linux"
 
+COLOR_TERMS = frozenset(("xterm", "xterm-color", "xterm-256color"))
+EXPERIMENTAL_DEPENDENCIES = (   # (package, module)
+    ("pygame-ce", "pygame"),
+    ("pyperclip", "pyperclip"),
+    ("pystray", "pystray"),
+) + ((("pygobject", "gi"),) if sys.platform == "linux" else ())
+
+
+@functools.lru_cache(maxsize=1)
+def load_pyproject():
+    """Load pyproject.toml, parsed only once"""
+    try:
+        with open("pyproject.toml", "rb") as f:
+            return tomllib.load(f)
+    except FileNotFoundError:
+        print("pyproject.toml file not found", file=sys.stderr)
+        sys.exit(1)
+
 
 def load_build_config():
     """Load build config from pyproject.toml"""
-    if os.path.exists("pyproject.toml"):
-        with open("pyproject.toml", "rb") as f:
-            data = tomllib.load(f)
-        return data.get("build", {})
-    print("pyproject.toml file not found", file=sys.stderr)
-    sys.exit(1)
+    return load_pyproject().get("build", {})
 
 
 def get_app_name():
     """Get app name from pyproject.toml"""
-    if os.path.exists("pyproject.toml"):
-        with open("pyproject.toml", "rb") as f:
-            data = tomllib.load(f)
-        if "project" in data and "version" in data["project"]:
-            return str(data["project"]["name"])
-        print("App name not specified in pyproject.toml", file=sys.stderr)
-        sys.exit(1)
-    print("pyproject.toml file not found", file=sys.stderr)
+    data = load_pyproject()
+    if "project" in data and "name" in data["project"]:
+        return str(data["project"]["name"])
+    print("App name not specified in pyproject.toml", file=sys.stderr)
     sys.exit(1)
 
 
 def get_media_packages():
     """Get media packages from pyproject.toml"""
-    if os.path.exists("pyproject.toml"):
-        with open("pyproject.toml", "rb") as f:
-            data = tomllib.load(f)
-        dependencies = data["dependency-groups"]["media"]
-        names = []
-        for dependency in dependencies:
-            names.append(re.split(r"[<>=!~]", dependency)[0].strip())
-        return names
-    print("pyproject.toml file not found", file=sys.stderr)
-    sys.exit(1)
+    dependencies = load_pyproject()["dependency-groups"]["media"]
+    names = []
+    for dependency in dependencies:
+        names.append(re.split(r"[<>=!~]", dependency)[0].strip())
+    return names
 
 
 def get_version_number():
     """Get version number from pyproject.toml"""
-    if os.path.exists("pyproject.toml"):
-        with open("pyproject.toml", "rb") as f:
-            data = tomllib.load(f)
-        if "project" in data and "version" in data["project"]:
-            return str(data["project"]["version"])
-        print("Version not specified in pyproject.toml", file=sys.stderr)
-        sys.exit(1)
-    print("pyproject.toml file not found", file=sys.stderr)
+    data = load_pyproject()
+    if "project" in data and "version" in data["project"]:
+        return str(data["project"]["version"])
+    print("Version not specified in pyproject.toml", file=sys.stderr)
     sys.exit(1)
 
 
@@ -105,7 +130,7 @@ def supports_color():
         return (os.getenv("ANSICON") is not None or
             os.getenv("WT_SESSION") is not None or
             os.getenv("TERM_PROGRAM") == "vscode" or
-            os.getenv("TERM") in ("xterm", "xterm-color", "xterm-256color")
+            os.getenv("TERM") in COLOR_TERMS
         )
     if not sys.stdout.isatty():
         return False
@@ -191,6 +216,12 @@ def get_nice_python_version():
     return version[:start] + version[version.find(")", start):]
 
 
+@functools.lru_cache(maxsize=1)
+def get_uv_version():
+    """Get uv version string, uv is run only once"""
+    return subprocess.run(["uv", "--version"], capture_output=True, text=True, check=True).stdout.strip()
+
+
 def check_python():
     """Check python version and print warning, and return True if running inside pure python (no uv)"""
     if sys.version_info.major != 3:
@@ -202,8 +233,7 @@ def check_python():
             fprint(f'WARNING: Python {sys.version_info.major}.{sys.version_info.minor} is not supported but build may succeed. Run "python build.py" to let uv download and setup recommended temporary python interpreter.', color=RED)
         else:
             try:
-                version = subprocess.run(["uv", "--version"], capture_output=True, text=True, check=True)
-                fprint(f"Using {version.stdout.strip()}")
+                fprint(f"Using {get_uv_version()}")
             except Exception:
                 pass
             fprint(f"Using Python {get_nice_python_version()}")
@@ -215,7 +245,7 @@ def check_python():
         return False
 
     try:
-        version = subprocess.run(["uv", "--version"], capture_output=True, text=True, check=True)
+        get_uv_version()
     except subprocess.CalledProcessError as e:
         fprint(f"uv error: {e}", color=RED, prefix="", file=sys.stderr)
         sys.exit(1)
@@ -270,25 +300,55 @@ def check_patchelf():
         pass
 
 
+@functools.lru_cache(maxsize=None)
+def check_dep(dep):
+    """Check if specified dependency is installed, result is cached until venv is changed"""
+    return importlib.util.find_spec(dep) is not None
+
+
 def check_deps(*deps):
     """Check if specified dependencies are installed"""
-    for dep in deps:
-        if importlib.util.find_spec(dep) is None:
-            return False
-    return True
+    return all(check_dep(dep) for dep in deps)
+
+
+def invalidate_deps_cache():
+    """Clear cached dependency checks after venv is changed"""
+    check_dep.cache_clear()
+    importlib.invalidate_caches()
+    if os.path.exists(NUMPY_LITE_MARKER):   # numpy might have been reinstalled
+        os.remove(NUMPY_LITE_MARKER)
+
+
+def get_numpy_fingerprint():
+    """
+    Get version and install time of numpy in venv, or None if its not installed.
+    Install time is from dist-info RECORD, so it changes on every reinstall, even with same version.
+    """
+    try:
+        dist = importlib.metadata.distribution("numpy")
+    except importlib.metadata.PackageNotFoundError:
+        return None
+    for file in dist.files or []:
+        if file.name == "RECORD":
+            try:
+                return f"{dist.version} {os.stat(file.locate()).st_mtime_ns}"
+            except OSError:
+                return None
+    return None
 
 
 def setup_dependencies(level, set_dev):
     """Setup first stage of dependencies based on provided level"""
     restore_file("pyproject.toml", ".pyproject.toml.bak")
+    load_pyproject.cache_clear()
 
+    venv_changed = True
     if level == "FULL" and (not check_deps("av", "dave", "PIL", "nacl") or (set_dev and not check_deps("nuitka"))):
         subprocess.run(["uv", "sync", "--group=media"] + (["--group=build"] if set_dev else []), check=True)
 
     elif level == "MEDIUM" and (not check_deps("PIL") or check_deps("av") or (set_dev and not check_deps("nuitka"))):
         subprocess.run(["uv", "sync"] + (["--group=build"] if set_dev else []), check=True)
-        with open("pyproject.toml", "rb") as f:
-            media_deps = tomllib.load(f).get("dependency-groups", {}).get("media", {})
+        media_deps = load_pyproject().get("dependency-groups", {}).get("media", {})
         medium_deps = load_build_config().get("medium_deps", [])
         for media_dep in media_deps:
             if any(x in media_dep for x in medium_deps):
@@ -311,6 +371,11 @@ def setup_dependencies(level, set_dev):
             subprocess.run(["uv", "sync", "--group=build"], check=True)
         fprint("WARNING: pyproject.toml is modified! Backup is '.pyproject.toml.bak'", color=RED)
 
+    else:
+        venv_changed = False
+
+    if venv_changed:
+        invalidate_deps_cache()
     fprint(f"Environment configured to endcord-{level} with{"" if set_dev else "out"} build dependencies")
 
 
@@ -324,7 +389,9 @@ def force_ujson():
 def build_third_party_licenses(exclude=[]):
     """Collect and build all licenses found in venv into THIRD_PARTY_LICENSES.txt file"""
     fprint("Building list of third party licenses")
-    subprocess.run(["uv", "pip", "install", "pip-licenses"], check=True)
+    preinstalled = check_dep("piplicenses")
+    if not preinstalled:
+        subprocess.run(["uv", "pip", "install", "pip-licenses"], check=True)
     command = [
         "uv", "run", "pip-licenses",
         "--ignore-packages", *exclude,
@@ -334,33 +401,63 @@ def build_third_party_licenses(exclude=[]):
         "--output-file=THIRD_PARTY_LICENSES.txt",
     ]
     subprocess.run(command, check=True)
-    subprocess.run(["uv", "pip", "uninstall", "pip-licenses", "prettytable", "wcwidth"], check=True)
-    shutil.rmtree("build")
+    if not preinstalled:
+        subprocess.run(["uv", "pip", "uninstall", "pip-licenses", "prettytable", "wcwidth"], check=True)
+    shutil.rmtree("build", ignore_errors=True)
     sys.exit(0)
 
 
 def get_cython_bins(directory="endcord_cython", startswith=None):
     """Get list of all cython built binaries"""
-    files = os.listdir(directory)
-    bins = []
-    for file in files:
-        if (not startswith or file.startswith(startswith)) and (file.endswith(".pyd") or file.endswith(".so")):
-            bins.append(file)
-    return bins
+    with os.scandir(directory) as entries:
+        return [
+            entry.name for entry in entries
+            if entry.name.endswith((".pyd", ".so")) and (not startswith or entry.name.startswith(startswith)) and entry.is_file()
+        ]
+
+
+@functools.lru_cache(maxsize=1)
+def get_venv_site_packages():
+    """Get site-packages dir of current venv"""
+    lib_dir = os.path.join(".venv", "Lib" if sys.platform == "win32" else "lib")
+    site_packages = os.path.join(lib_dir, "site-packages")
+    if os.path.isdir(site_packages):
+        return site_packages
+    try:
+        with os.scandir(lib_dir) as entries:
+            for entry in entries:
+                if entry.name.startswith("python") and entry.is_dir():
+                    site_packages = os.path.join(entry.path, "site-packages")
+                    if os.path.isdir(site_packages):
+                        return site_packages
+    except FileNotFoundError:
+        pass
+    return None
 
 
 def find_file_in_venv(lib_name, file_name, silent=False, recurse=False, startswith=False):
     """Search for file in specified library in current venv"""
     if isinstance(file_name, list):
         file_name = os.path.join(*file_name)
-    for root, dirs, files in os.walk(".venv"):
-        path_parts = root.split(os.sep)
-        if lib_name in path_parts:
-            if not recurse and path_parts[-1] != lib_name:
-                continue
-            for f in files:
-                if (startswith and f.startswith(file_name)) or f == file_name:
-                    return os.path.join(root, f)
+    site_packages = get_venv_site_packages()
+    if site_packages:
+        lib_dir = os.path.join(site_packages, lib_name)
+        path = os.path.join(lib_dir, file_name)
+        if os.path.isfile(path):
+            return path
+        if recurse or startswith:
+            dirs = [lib_dir]
+            while dirs:
+                try:
+                    with os.scandir(dirs.pop()) as entries:
+                        for entry in entries:
+                            if entry.is_dir(follow_symlinks=False):
+                                if recurse:
+                                    dirs.append(entry.path)
+                            elif (startswith and entry.name.startswith(file_name)) or entry.name == file_name:
+                                return entry.path
+                except FileNotFoundError:
+                    pass
     if not silent:
         iprint(f"{lib_name}/{file_name} not found")
     return None
@@ -374,6 +471,22 @@ def check_venv_file_size(lib_name, file_name, min_file_size):
     return os.stat(path).st_size > min_file_size
 
 
+def patch_venv_file(lib_name, file_name, pattern, replacement):
+    """Apply compiled regex substitution once to file in specified library in current venv"""
+    path = find_file_in_venv(lib_name, file_name)
+    if not path:
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    text, count = pattern.subn(replacement, text, count=1)
+    if count:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        iprint(f"Patched file: {path}")
+    else:
+        iprint(f"Nothing to patch in file {path}")
+
+
 def patch_soundcard():
     """
     Search for soundcard/mediafoundation.py in .venv
@@ -385,55 +498,8 @@ def patch_soundcard():
     if not os.path.exists(".venv"):
         iprint(".venv dir not found")
         return
-
-    # patch mediafoundation.py
-    path = find_file_in_venv("soundcard", "mediafoundation.py")
-    if not path:
-        return
-    with open(path, "r", encoding="utf-8") as f:
-        lines = f.readlines()
-
-    pattern = re.compile(r"^(\s*)_ole32\.CoUninitialize\(\)")
-    changed = False
-    for num, line in enumerate(lines):
-        match = re.match(pattern, line)
-        if match:
-            indent = match.group(1)
-            lines[num] = f"{indent}if _ole32: _ole32.CoUninitialize()\n"
-            changed = True
-            break
-
-    if changed:
-        with open(path, "w", encoding="utf-8") as f:
-            f.writelines(lines)
-        iprint(f"Patched file: {path}")
-    else:
-        iprint(f"Nothing to patch in file {path}")
-
-    # patch pulseaudio.py
-    path = find_file_in_venv("soundcard", "pulseaudio.py")
-    if not path:
-        return
-    with open(path, "r", encoding="utf-8") as f:
-        lines = f.readlines()
-
-    pattern = re.compile(r"^(\s*)assert self\._pa_context_get_state")
-    changed = False
-    for num, line in enumerate(lines):
-        match = re.match(pattern, line)
-        if match:
-            indent = match.group(1)
-            lines[num] = f"{indent}if self._pa_context_get_state(self.context) != _pa.PA_CONTEXT_READY:\n"
-            lines.insert(num+1, f'{indent+"    "}raise RuntimeError("PulseAudio context not ready (no sound system?)")\n')
-            changed = True
-            break
-
-    if changed:
-        with open(path, "w", encoding="utf-8") as f:
-            f.writelines(lines)
-        iprint(f"Patched file: {path}")
-    else:
-        iprint(f"Nothing to patch in file {path}")
+    patch_venv_file("soundcard", "mediafoundation.py", SOUNDCARD_OLE32_PATTERN, SOUNDCARD_OLE32_REPLACEMENT)
+    patch_venv_file("soundcard", "pulseaudio.py", SOUNDCARD_PULSE_PATTERN, SOUNDCARD_PULSE_REPLACEMENT)
 
 
 def compress_emoji():
@@ -446,112 +512,121 @@ def compress_emoji():
         return None
     if not os.path.exists("build"):
         os.makedirs("build", exist_ok=True)
-    with open(json_path_in, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    with open(json_path_out, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=None, separators=(",", ":"))
+    with open(json_path_in, "rb") as f:
+        data = f.read()
+    try:
+        import orjson
+        data = orjson.dumps(orjson.loads(data))   # compact and non-ascii preserving by default
+    except ImportError:
+        data = json.dumps(json.loads(data), ensure_ascii=False, indent=None, separators=(",", ":")).encode("utf-8")
+    with open(json_path_out, "wb") as f:
+        f.write(data)
     return json_path_out
 
 
+def read_header(path, size=4096):
+    """Read only first size bytes of the file"""
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        return os.read(fd, size)
+    finally:
+        os.close(fd)
+
+
+def iter_source_files():
+    """Yield paths of all python and cython source files"""
+    for source_dir in SOURCE_DIRS:
+        for path, subdirs, files in os.walk(source_dir):
+            subdirs[:] = [d for d in subdirs if not (d.startswith(".") or d in SKIP_DIRS)]
+            for name in files:
+                if not name.startswith(".") and (name.endswith(".py") or name.endswith(".pyx")):
+                    yield os.path.join(path, name)
+
+
+def is_experimental_enabled():
+    """Check if experimental mode is enabled, stopping at first file importing curses"""
+    for path in iter_source_files():
+        header = read_header(path)
+        if b"curses" not in header:
+            continue
+        match = CURSES_IMPORT_PATTERN.search(header)
+        if match:
+            return match.group(1) != CURSES_IMPORT
+    return False
+
+
+def toggle_experimental_dependencies(enable):
+    """Install or uninstall experimental mode dependencies, skipping uv if venv is already in that state"""
+    if enable:
+        packages = [package for package, module in EXPERIMENTAL_DEPENDENCIES if not check_dep(module)]
+        if packages:
+            subprocess.run(["uv", "pip", "install", *packages], check=True)
+        fprint("Experimental windowed mode enabled!")
+    else:
+        packages = [package for package, module in EXPERIMENTAL_DEPENDENCIES if check_dep(module)]
+        if packages:
+            subprocess.run(["uv", "pip", "uninstall", *packages], check=True)
+        fprint("Experimental windowed mode disabled!")
+    if packages:
+        invalidate_deps_cache()
+
+
+def is_curses_binary(path):
+    """Check if cython binary is compiled with curses import, without importing it"""
+    with open(path, "rb") as f:
+        data = f.read()
+    return b"curses" in data and b"pgcurses" not in data
+
+
 def toggle_experimental(check_only=False):
     """Toggle experimental mode"""
-    whitelist = ("endcord" + os.sep, "endcord_cython" + os.sep)
-    file_list = []
-    for path, subdirs, files in os.walk(os.getcwd()):
-        subdirs[:] = [d for d in subdirs if not d.startswith(".")]
-        for name in files:
-            file_path = os.path.join(path, name)
-            file_relpath = os.path.relpath(file_path)
-            if not name.startswith(".") and (file_path.endswith(".py") or file_path.endswith(".pyx")) and any(x in file_relpath for x in whitelist):
-                file_list.append(file_path)
-    enable = False
-    for path in file_list:
-        # replace imports
-        with open(path, "r", encoding="utf-8") as f:
-            lines = f.readlines()
-        changed = False
-        for num, line in enumerate(lines):
-            if line.startswith("import curses"):
-                lines[num] = "from endcord import pgcurses as curses\n"
-                changed = True
-                enable = True
-                break
-            elif line.startswith("from endcord import pgcurses as curses"):
-                lines[num] = "import curses\n"
-                changed = True
-                enable = False
-                break
-        if changed and not check_only:
-            with open(path, "w", encoding="utf-8") as f:
-                f.writelines(lines)
     if check_only:
-        return not enable
-
-    # backup cython binaries
+        return is_experimental_enabled()
+    enable = False
+    for path in iter_source_files():
+        # replace imports, they are always at the top of the file
+        header = read_header(path)
+        if b"curses" not in header:
+            continue
+        match = CURSES_IMPORT_PATTERN.search(header)
+        if not match:
+            continue
+        with open(path, "rb") as f:
+            data = f.read()
+        enable = match.group(1) == CURSES_IMPORT
+        replacement = PGCURSES_IMPORT if enable else CURSES_IMPORT
+        with open(path, "wb") as f:
+            f.write(data[:match.start()] + replacement + data[match.end():])
+
+    # backup cython binaries that were compiled with real curses
     if enable:
         bins = get_cython_bins(directory="endcord_cython")
-        if bins:
-            for binary in bins:
-                try:
-                    importlib.import_module("endcord_cython." + binary.split(".")[0])
-                except ImportError:
-                    pass
-            if "curses" in sys.modules:
-                for file in bins:
-                    old_name = os.path.join("endcord_cython", file)
-                    new_name = os.path.join("endcord_cython", "bkp_" + file)
-                    if os.path.exists(new_name):
-                        os.remove(new_name)
-                    os.rename(old_name, new_name)
-    else:
-        bins = get_cython_bins(directory="endcord_cython", startswith="bkp_")
-        if bins:
-            error = False
-            for binary in bins:
-                try:
-                    importlib.import_module("endcord_cython." + binary.split(".")[0])
-                except ImportError:
-                    error = True
-                    break
-            if "curses" in sys.modules or error:
-                for file in bins:
-                    old_name = os.path.join("endcord_cython", file)
-                    new_name = os.path.join("endcord_cython", file[4:])
-                    if os.path.exists(new_name):
-                        os.remove(new_name)
-                    os.rename(old_name, new_name)
-
-    # toggle dependencies
-    experimental_dependencies = ["pygame-ce", "pyperclip", "pystray"]
-    if sys.platform == "linux":
-        experimental_dependencies += ["pygobject"]
-    if enable:
-        subprocess.run(["uv", "pip", "install"] + experimental_dependencies, check=True)
-        fprint("Experimental windowed mode enabled!")
+        if any(is_curses_binary(os.path.join("endcord_cython", binary)) for binary in bins):
+            for file in bins:
+                old_name = os.path.join("endcord_cython", file)
+                new_name = os.path.join("endcord_cython", "bkp_" + file)
+                os.replace(old_name, new_name)
     else:
-        subprocess.run(["uv", "pip", "uninstall"] + experimental_dependencies, check=True)
-        fprint("Experimental windowed mode disabled!")
+        for file in get_cython_bins(directory="endcord_cython", startswith="bkp_"):
+            old_name = os.path.join("endcord_cython", file)
+            new_name = os.path.join("endcord_cython", file[4:])
+            os.replace(old_name, new_name)
+
+    toggle_experimental_dependencies(enable)
     return not enable
 
 
 def enable_extensions(enable=True, check_only=False, silent=False):
     """"Enable/disable extensions support in the code"""
     path = "./endcord/app.py"
-    with open(path, "r", encoding="utf-8") as f:
-        lines = f.readlines()
-    changed = False
-    for num, line in enumerate(lines):
-        if line.startswith("ENABLE_EXTENSIONS = "):
-            if "True" in line and enable:
-                break
-            elif "False" in line and not enable:
-                break
-            lines[num] = f"ENABLE_EXTENSIONS = {bool(enable)}\n"
-            changed = True
-            break
-    if changed and not check_only:
-        with open(path, "w", encoding="utf-8") as f:
-            f.writelines(lines)
+    match = EXTENSIONS_FLAG_PATTERN.search(read_header(path))   # flag is near the top of the file
+    if (not match or (match.group(1) == b"True") != bool(enable)) and not check_only:
+        with open(path, "rb") as f:
+            data = f.read()
+        match = EXTENSIONS_FLAG_PATTERN.search(data)
+        if match:
+            with open(path, "wb") as f:
+                f.write(data[:match.start(1)] + str(bool(enable)).encode() + data[match.end(1):])
     if not check_only and not silent:
         fprint(f"Extensions are {"enabled" if enable else "disabled"}!")
 
@@ -697,19 +772,43 @@ def build_generic_package(package, clang, safe=False):
     subprocess.run(["uv", "-q", "pip", "uninstall", "pip"], check=True)
 
 
+def numpy_has_blas(in_process=False):
+    """Check if numpy in venv is linked to blas, return None if numpy cant be imported"""
+    if in_process:
+        try:
+            import numpy
+            return bool(numpy.__config__.show_config("dicts")["Build Dependencies"]["blas"].get("found", False))
+        except Exception:
+            return None
+    value = subprocess.run(["uv", "run", "python", "-c", NUMPY_BLAS_CHECK], capture_output=True, text=True, check=False).stdout.strip()
+    if not value:
+        return None
+    return bool(int(value))
+
+
+def mark_numpy_lite(numpy_fingerprint):
+    """Save numpy fingerprint to marker file so numpy-lite checks can be skipped in next builds"""
+    if numpy_fingerprint:
+        with open(NUMPY_LITE_MARKER, "w", encoding="utf-8") as f:
+            f.write(numpy_fingerprint)
+
+
 def build_numpy_lite(clang):
     """Build numpy without openblass to reduce final binary size"""
     if sys.platform != "linux":
         fprint("Skipping numpy-lite (no openblas) building on non-linux platforms")
         return
     fprint("Building numpy-lite (no openblas) with custom compiler args")
-    check_openblas_cmd = [
-        "uv", "run", "python", "-c",
-        "import numpy; print(int(numpy.__config__.show_config('dicts')['Build Dependencies']['blas'].get('found', False)))",
-    ]   # check if numpy without blas is not already installed
-    value = subprocess.run(check_openblas_cmd, capture_output=True, text=True, check=False).stdout.strip()
-    if not value or not int(value):
+    numpy_fingerprint = get_numpy_fingerprint()
+    if numpy_fingerprint and os.path.exists(NUMPY_LITE_MARKER):
+        with open(NUMPY_LITE_MARKER, "r", encoding="utf-8") as f:
+            if f.read().strip() == numpy_fingerprint:   # same numpy install that was verified before
+                iprint("Numpy-lite (no openblas) is already built locally")
+                return
+    # check if numpy without blas is not already installed, in this process if its running from venv
+    if not numpy_has_blas(in_process=bool(os.environ.get("UV", ""))):
         iprint("Numpy-lite (no openblas) is already built locally")
+        mark_numpy_lite(numpy_fingerprint)
         return
     setup_compiler(clang)
     subprocess.run(["uv", "-q", "pip", "install", "pip"], check=True)   # because uv wont work with --config-settings as it should
@@ -728,9 +827,11 @@ def build_numpy_lite(clang):
         print(e, flush=True)
         fprint("Failed building numpy-lite, faling back to default numpy", color=RED, prefix="")
         subprocess.run(["uv", "-q", "pip", "install", "numpy"], check=True)
-    value = subprocess.run(check_openblas_cmd, capture_output=True, text=True, check=False).stdout.strip()
-    if value and int(value):
+    if numpy_has_blas():
         iprint("Verification failed: numpy after building is still linked to openblas!", color=RED)
+    else:
+        importlib.invalidate_caches()
+        mark_numpy_lite(get_numpy_fingerprint())
     subprocess.run(["uv", "-q", "pip", "uninstall", "pip"], check=True)
 
 
@@ -749,20 +850,19 @@ def build_cython(clang, mingw):
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
         text=True,
-        bufsize=1,
+        bufsize=65536,
     )
     for line in process.stdout:
         line_clean = line.rstrip("\n")
-        if len(line_clean) < 100 and not any(s in line_clean for s in ("Cythonizing", "Compiling", "creating", "  warn(", "build_ext")):
-            fprint(line_clean.capitalize(), flush=True)
+        if len(line_clean) < 100 and not CYTHON_SKIP_PATTERN.search(line_clean):
+            fprint(line_clean.capitalize())
     process.wait()
     if process.returncode != 0:
         raise subprocess.CalledProcessError(process.returncode, cmd)
 
-    files = [f for f in os.listdir("endcord_cython") if f.endswith(".c")]
-    for f in files:
-        os.remove(os.path.join("endcord_cython", f))
-    shutil.rmtree("build")
+    shutil.rmtree("build", ignore_errors=True)
+    for path in glob.iglob(os.path.join("endcord_cython", "*.c")):
+        os.remove(path)
 
 
 def build_with_pyinstaller(level, onedir, print_cmd=False):
@@ -821,11 +921,9 @@ def build_with_pyinstaller(level, onedir, print_cmd=False):
 
     # cleanup
     fprint("Cleaning up")
-    try:
+    if os.path.exists(f"{pkgname}.spec"):
         os.remove(f"{pkgname}.spec")
-        shutil.rmtree("build")
-    except FileNotFoundError:
-        pass
+    shutil.rmtree("build", ignore_errors=True)
     fprint(f"Finished building {pkgname}")
 
 
@@ -843,10 +941,10 @@ def build_with_nuitka(level, onedir, clang, mingw, compile_deps, print_cmd=False
                 fprint("Building pycryptodome with custom compiler args")
                 iprint("Pycryptodome is already built locally")
             if level == "FULL":
-                if check_venv_file_size("pynacl", "_sodium.", 1000000):
-                    fprint("Building pycryptodome with custom compiler args")
+                if check_venv_file_size("nacl", "_sodium.", 1000000):
                     build_generic_package("pynacl", clang)
                 else:
+                    fprint("Building pynacl with custom compiler args")
                     iprint("PyNaCl is already built locally")
         patch_soundcard()
     static_python = False   # might be useful with custom python build
@@ -933,10 +1031,7 @@ def build_with_nuitka(level, onedir, clang, mingw, compile_deps, print_cmd=False
 
     # cleanup
     fprint("Cleaning up")
-    try:
-        shutil.rmtree("build")
-    except FileNotFoundError:
-        pass
+    shutil.rmtree("build", ignore_errors=True)
     fprint(f"Finished building {pkgname}")
 
 
@@ -1051,8 +1146,7 @@ if __name__ == "__main__":
             build_with_pyinstaller(args.level, args.onedir, print_cmd=True)
         sys.exit(0)
 
-    if os.path.exists("build"):   # ensure clean build env
-        shutil.rmtree("build")
+    shutil.rmtree("build", ignore_errors=True)   # ensure clean build env
 
     if args.custom_python:
         ensure_custom_python(args.safe, clang, compile_deps)
@@ -1075,11 +1169,7 @@ if __name__ == "__main__":
 
     experimental = toggle_experimental(check_only=True)
     if experimental:
-        experimental_dependencies = ["pygame-ce", "pyperclip", "pystray"]
-        if sys.platform == "linux":
-            experimental_dependencies += ["pygobject"]
-        subprocess.run(["uv", "pip", "install"] + experimental_dependencies, check=True)
-        fprint("Experimental windowed mode enabled!")
+        toggle_experimental_dependencies(True)
 
     enable_extensions(enable=(not args.disable_extensions))
 
@@ -2930,7 +2930,7 @@ class Endcord:
                         self.update_extra_line("Nothing happens", color=20)
                     if not text_to_send.strip():
                         continue
-                    if input_text.startswith("+:") and (utils.is_emoji(text_to_send[1:]) or bool(re.search(formatter.match_d_emoji, text_to_send[2:]))):
+                    if input_text.startswith("+:") and (utils.is_emoji(text_to_send[1:]) or bool(formatter.match_d_emoji.search(text_to_send[2:]))):
                         msg_index = self.lines_to_msg(chat_sel)
                         discord_emoji = input_text.startswith("+:<")
                         self.build_reaction(text_to_send[1 + discord_emoji:], msg_index=msg_index)
@@ -3844,7 +3844,7 @@ class Endcord:
                 if len(cmd_args["text"]) > 128:
                     self.update_extra_line("Text has been trimmed to 128 characters")
             elif "emoji" in cmd_args:
-                match = re.search(formatter.match_d_emoji, cmd_args["emoji"])
+                match = formatter.match_d_emoji.search(cmd_args["emoji"])
                 if match:
                     if self.premium:
                         self.my_status["custom_status_emoji"] = {
@@ -4011,7 +4011,7 @@ class Endcord:
 
         elif cmd_type == 57:   # VIEW_EMOJI
             if cmd_args.get("name"):
-                match = re.search(formatter.match_d_emoji, cmd_args["name"])
+                match = formatter.match_d_emoji.search(cmd_args["name"])
                 if match:
                     self.view_emoji(match.group(3))
             else:
@@ -4292,7 +4292,7 @@ class Endcord:
             valid = False
             if emoji_string.startswith("<:"):   # discord emoji
                 # validate discord emoji before adding it
-                match = re.match(formatter.match_d_emoji, emoji_string)
+                match = formatter.match_d_emoji.match(emoji_string)
                 if match:
                     emoji_id = match.group(3)
                     for guild in self.gateway.get_emojis():
@@ -4306,14 +4306,13 @@ class Endcord:
                         if valid or not self.premium:
                             break
             elif emoji_string.startswith(":"):   # standard emoji :name:
-                for emoji in utils.EMOJI_DATA.values():
-                    if emoji_string in emoji:
-                        emoji_string = min(emoji, key=len).strip(":")
-                        valid = True
-                        break
+                emoji = utils.EMOJI_SHORTCODES.get(emoji_string)
+                if emoji:
+                    emoji_string = utils.EMOJI_NAMES[emoji].strip(":")
+                    valid = True
             elif utils.is_emoji(emoji_string):   # standard emoji char
                 valid = True
-                emoji_string = utils.demojize(emoji_string).strip(":")
+                emoji_string = utils.EMOJI_NAMES[emoji_string].strip(":")
             if valid and emoji_string:
                 if emoji_string in self.state["favorite_emojis"]:
                     self.state["favorite_emojis"].remove(emoji_string)
@@ -5436,7 +5435,7 @@ class Endcord:
         extra_title, extra_body, extra_format = formatter.generate_extra_window_profile(user_data, roles, selected_presence, self.colors, max_w)
         if self.emoji_as_text:
             extra_title = utils.demojize(extra_title)
-            extra_body = [utils.demojize(x) for x in extra_body]
+            extra_body = utils.demojize_many(extra_body)
         self.tui.draw_extra_window(extra_title, extra_body, extra_format, reset_scroll=reset)
         self.extra_window_open = True
 
@@ -5728,7 +5727,7 @@ class Endcord:
 
         # discord emoji
         else:
-            match = re.match(formatter.match_d_emoji, emoji_string)
+            match = formatter.match_d_emoji.match(emoji_string)
             if match:
                 emoji_name = match.group(2)
                 emoji_id = match.group(3)
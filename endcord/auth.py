@@ -4,7 +4,6 @@
 
 import base64
 import http.client
-import json
 import logging
 import random
 import socket
@@ -15,6 +14,14 @@ import threading
 import time
 import urllib.parse
 
+try:
+    import orjson as json
+except ImportError:
+    try:
+        import ujson as json
+    except ImportError:
+        import json
+
 import websocket
 from Crypto.Cipher import PKCS1_OAEP
 from Crypto.Hash import SHA256
@@ -24,8 +31,25 @@ DISCORD_HOST = "discord.com"
 DISCORD_HOST_GATEWY = "wss://remote-auth-gateway.discord.gg/"
 DISCORD_CDN_HOST = "cdn.discordapp.com"
 DYN_DISCORD_CDN_HOST = "media.discordapp.net"
+HEARTBEAT_FRAME = json.dumps({"op": "heartbeat"})
+RSA_KEY_TTL = 300   # seconds generated keypair is reused for new remote auth sessions
 logger = logging.getLogger(__name__)
 status_unpacker = struct.Struct("!H")
+rsa_key_cache = (None, 0)   # (private_key, expire_time)
+ssl_context = None
+
+
+def get_ssl_context():
+    """Get ssl context shared by all connections, so CA certificates are loaded only once"""
+    global ssl_context
+    if ssl_context is None:
+        if sys.platform == "darwin":
+            import certifi
+            ssl_context = ssl.create_default_context(cafile=certifi.where())
+        else:
+            ssl_context = ssl.create_default_context()
+        ssl_context.minimum_version = ssl.TLSVersion.TLSv1_2
+    return ssl_context
 
 
 def log_api_error(response, function_name):
@@ -41,7 +65,7 @@ def log_api_error(response, function_name):
                 error_message = data.get("captcha_key")
         except json.JSONDecodeError:
             error_code = "None"
-            error_message = data.decode("utf-8").strip()
+            error_message = data[:200].decode("utf-8", "replace").strip()   # can be whole html page
     else:
         error_code = error_message = None
     if error_code:
@@ -84,12 +108,7 @@ class Discord():
 
     def get_connection(self, host, port, timeout=2):
         """Get connection object and handle proxying"""
-        if sys.platform == "darwin":
-            import certifi
-            ssl_context = ssl.create_default_context(cafile=certifi.where())
-        else:
-            ssl_context = ssl.create_default_context()
-        ssl_context.minimum_version = ssl.TLSVersion.TLSv1_2
+        ssl_context = get_ssl_context()
         if not self.proxy:
             return http.client.HTTPSConnection(host, port, timeout=timeout, context=ssl_context)
         try:
@@ -101,7 +120,6 @@ class Discord():
                 from python_socks.sync import Proxy
                 proxy = Proxy.from_url(self.proxy)
                 raw_sock = proxy.connect(dest_host=host, dest_port=port, timeout=10)
-                ssl_context = ssl.create_default_context()
                 proxy_sock = ssl_context.wrap_socket(raw_sock, server_hostname=host)
                 connection = http.client.HTTPSConnection(host, port, timeout=timeout + 5)   # extra time for tor
                 connection.sock = proxy_sock
@@ -322,10 +340,12 @@ class Gateway():
         self.proxy = proxy
         self.run = True
         self.state = 0
+        self.state_changed = threading.Event()
         self.heartbeat_received = True
         self.heartbeat_interval = 30
         self.timeout = 100
-        self.remaining_til_timeout = int(self.timeout)
+        self.start_time = time.monotonic()
+        self.heartbeat_stop = threading.Event()
         self.fingerprint = None
         self.user_id = ""
         self.username = ""
@@ -334,13 +354,7 @@ class Gateway():
 
     def connect_ws(self):
         """Connect to websocket"""
-        if sys.platform == "darwin":
-            import certifi
-            ssl_context = ssl.create_default_context(cafile=certifi.where())
-        else:
-            ssl_context = ssl.create_default_context()
-        ssl_context.minimum_version = ssl.TLSVersion.TLSv1_2
-        self.ws = websocket.WebSocket(sslopt={"context": ssl_context})
+        self.ws = websocket.WebSocket(sslopt={"context": get_ssl_context()})
         if self.proxy:
             proxy = urllib.parse.urlsplit(self.proxy)
             scheme = proxy.scheme
@@ -375,7 +389,7 @@ class Gateway():
             self.connect_ws()
         except websocket._exceptions.WebSocketAddressException:
             return False
-        self.state = 0
+        self.set_state(0)
         self.receiver_thread = threading.Thread(target=self.receiver, daemon=True)
         self.receiver_thread.start()
         self.heartbeat_thread = threading.Thread(target=self.send_heartbeat, daemon=True)
@@ -385,18 +399,27 @@ class Gateway():
 
 
     def send(self, request):
-        """Send data to gateway"""
+        """Send data to gateway, request can be dict or already serialized json"""
+        if isinstance(request, dict):
+            request = json.dumps(request)
         try:
-            self.ws.send(json.dumps(request))
+            self.ws.send(request)
         except websocket._exceptions.WebSocketException:
-            self.state = 4
+            self.set_state(4)
             self.heartbeat_running = False
+            self.heartbeat_stop.set()
             self.disconnect_ws(timeout=0)
 
 
     def init_rsa_keypair(self):
-        """Initialize rsa keypair"""
-        self.private_key = RSA.generate(2048)
+        """Initialize rsa keypair, reusing recently generated one because generating is slow"""
+        global rsa_key_cache
+        private_key, expire_time = rsa_key_cache
+        if private_key is None or time.monotonic() >= expire_time:
+            private_key = RSA.generate(2048)
+            rsa_key_cache = (private_key, time.monotonic() + RSA_KEY_TTL)
+        self.private_key = private_key
+        self.cipher = PKCS1_OAEP.new(private_key, hashAlgo=SHA256)
         public_key = self.private_key.publickey()
         spki_der = public_key.export_key(format="DER")
         return base64.b64encode(spki_der).decode("utf-8")
@@ -404,23 +427,20 @@ class Gateway():
 
     def decrypt_nonce(self, encrypted_nonce):
         """Decrypt nonce proof received from server"""
-        cipher = PKCS1_OAEP.new(self.private_key, hashAlgo=SHA256)
-        nonce = cipher.decrypt(base64.b64decode(encrypted_nonce))
+        nonce = self.cipher.decrypt(base64.b64decode(encrypted_nonce))
         return base64.urlsafe_b64encode(nonce).decode("utf-8").rstrip("=")
 
 
     def decrypt_user_payload(self, user_payload):
         """Decrypt user payload received when remote authentication session starts"""
-        cipher = PKCS1_OAEP.new(self.private_key, hashAlgo=SHA256)
-        user_payload_bytes = cipher.decrypt(base64.b64decode(user_payload))
-        user_id, _, _, username = user_payload_bytes.decode("utf-8").split(":")
+        user_payload_bytes = self.cipher.decrypt(base64.b64decode(user_payload))
+        user_id, _, _, username = user_payload_bytes.decode("utf-8").split(":", 3)
         return user_id, username
 
 
     def decrypt_token(self, encrypted_token):
         """Decrypt token received from ticket-token exchange"""
-        cipher = PKCS1_OAEP.new(self.private_key, hashAlgo=SHA256)
-        decrypted = cipher.decrypt(base64.b64decode(encrypted_token))
+        decrypted = self.cipher.decrypt(base64.b64decode(encrypted_token))
         return decrypted.decode("utf-8")
 
 
@@ -462,7 +482,6 @@ class Gateway():
             elif opcode == "hello":
                 self.heartbeat_interval = int(response["heartbeat_interval"])
                 self.timeout = int(response["timeout_ms"]) / 1000
-                self.remaining_til_timeout = int(self.timeout)
 
             elif opcode == "nonce_proof":
                 encrypted_nonce = response["encrypted_nonce"]
@@ -474,23 +493,24 @@ class Gateway():
 
             elif opcode == "pending_remote_init":
                 self.fingerprint = response["fingerprint"]
-                self.state = 1
+                self.set_state(1)
 
             elif opcode == "pending_ticket":
                 encrypted_user_payload = response["encrypted_user_payload"]
                 self.user_id, self.username = self.decrypt_user_payload(encrypted_user_payload)
-                self.state = 2
+                self.set_state(2)
 
             elif opcode == "pending_login":
                 self.ticket = response["ticket"]
-                self.state = 3
+                self.set_state(3)
 
             elif opcode == "cancel":
-                self.state = 6
+                self.set_state(6)
                 break
 
         logger.debug("Receiver stopped")
         self.heartbeat_running = False
+        self.heartbeat_stop.set()
 
 
     def send_heartbeat(self):
@@ -498,29 +518,31 @@ class Gateway():
         logger.debug(f"Heartbeater started, interval={self.heartbeat_interval/1000} s")
         self.heartbeat_running = True
         self.heartbeat_received = True
-        start_time = int(time.time())
-        heartbeat_interval_rand = int(self.heartbeat_interval * (0.8 - 0.6 * random.random()) / 1000)
-        heartbeat_sent_time = int(time.time())
+        self.start_time = time.monotonic()
+        heartbeat_interval_rand = self.heartbeat_interval * (0.8 - 0.6 * random.random()) / 1000
+        heartbeat_sent_time = time.monotonic()
         while self.run and self.heartbeat_running:
-            if time.time() - heartbeat_sent_time >= heartbeat_interval_rand:
-                self.send({"op": "heartbeat"})
-                heartbeat_sent_time = int(time.time())
+            now = time.monotonic()
+            if now - heartbeat_sent_time >= heartbeat_interval_rand:
+                self.send(HEARTBEAT_FRAME)
+                heartbeat_sent_time = now
                 logger.debug("Sent heartbeat")
                 if not self.heartbeat_received:
                     logger.warning("Heartbeat reply not received")
                     break
                 self.heartbeat_received = False
-                heartbeat_interval_rand = int(self.heartbeat_interval * (0.8 - 0.6 * random.random()) / 1000)
-            self.remaining_til_timeout = int(max(self.timeout - (time.time() - start_time), 0))
-            if heartbeat_sent_time - time.time() >= self.timeout:
-                self.state = 5
+                heartbeat_interval_rand = self.heartbeat_interval * (0.8 - 0.6 * random.random()) / 1000
+            remaining = self.start_time + self.timeout - now
+            if remaining <= 0:
+                self.set_state(5)
                 self.disconnect_ws(timeout=0)
                 logger.warn("Auth gateway timeout")
                 return
             # sleep(heartbeat_interval * jitter), but jitter is limited to (0.1 - 0.9)
             # in this time heartbeat ack should be received from discord
-            time.sleep(1)
-        self.state = 4
+            # wake up on next heartbeat or session timeout, but not sooner than 1s, or when receiver stops
+            self.heartbeat_stop.wait(max(min(heartbeat_sent_time + heartbeat_interval_rand - now, remaining), 1))
+        self.set_state(4)
         self.disconnect_ws(timeout=0)
         logger.debug("Heartbeater stopped")
 
@@ -536,11 +558,23 @@ class Gateway():
         logger.debug("Initialized auth session")
 
 
+    def set_state(self, state):
+        """Set gateway state and wake up whoever is waiting for it to change"""
+        self.state = state
+        self.state_changed.set()
+
+
     def get_state(self):
-        """Get current gateway state"""
+        """Get current gateway state, and rearm wait_state"""
+        self.state_changed.clear()
         return self.state
 
 
+    def wait_state(self, timeout):
+        """Block until gateway state changes or timeout expires"""
+        self.state_changed.wait(timeout)
+
+
     def get_fingerprint(self):
         """Get fingerprint"""
         return self.fingerprint
@@ -558,4 +592,4 @@ class Gateway():
 
     def get_remaining_time(self):
         """Get remaining time in seconds before gateway timeout"""
-        return self.remaining_til_timeout
+        return int(max(self.start_time + self.timeout - time.monotonic(), 0))
@@ -59,6 +59,7 @@ match_md_all = re.compile(
     re.VERBOSE,
 )
 MARKER = "\uEE42"  # character from private use area
+match_wide = re.compile("[" + "".join(f"\\U{start:08x}-\\U{end:08x}" for start, end in WIDE_RANGES) + "]")
 
 
 def ceil(x):
@@ -93,7 +94,7 @@ def normalize_int_str(input_int, digits_limit):
 
 def demojize(text):
     """Safely demojize string"""
-    if not text:
+    if not text or text.isascii():
         return text
     return utils.demojize(text)
 
@@ -262,6 +263,9 @@ def move_by_indexes(indexes, *ranges_lists):
 
 def emoji_name(emoji_char):
     """Return emoji name from its Unicode"""
+    name = utils.EMOJI_NAMES.get(emoji_char)   # skip demojize for exact single emoji
+    if name:
+        return name.replace(":", "")
     return utils.demojize(emoji_char).replace(":", "")
 
 
@@ -269,16 +273,9 @@ def replace_wide(text, replacement=TREE_EMOJI_REPLACE):
     """Replace all wide characters in string with given character"""
     if not text:
         return ""
-    new_text = []
-    for i, ch in enumerate(text):
-        character = ord(ch)
-        if 0x20 <= character < 0x7f:
-            new_text.append(ch)
-        elif binary_search(character, WIDE_RANGES):
-            new_text.append(replacement)
-        else:
-            new_text.append(ch)
-    return "".join(new_text)
+    if text.isascii():
+        return text
+    return match_wide.sub(replacement.replace("\\", "\\\\"), text)
 
 
 def binary_search(codepoint, ranges):
@@ -556,7 +553,7 @@ def replace_discord_emoji(text, placeholder=None, *ranges_lists):
     emoji_ranges = []
     last_pos = 0
     offset = 0
-    for match in re.finditer(match_d_emoji, text):
+    for match in match_d_emoji.finditer(text):
         start, end = match.span()
         result.append(text[last_pos:start])
         if placeholder:
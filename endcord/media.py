@@ -12,8 +12,10 @@ import sys
 import threading
 import time
 import traceback
-from queue import Queue
+import zlib
+from queue import Empty, Queue
 
+import numpy as np
 from PIL import Image, ImageEnhance
 
 from endcord import minimagic
@@ -35,8 +37,11 @@ except (AssertionError, RuntimeError):
 from endcord import terminal_utils, xterm256
 
 BASE_SOUND_GAIN = 1.0
+REDUCING_GAP = 2.0   # large downscales first use fast integer reduce before LANCZOS
 ESC = "\x1b"
 RESET = f"{ESC}[0m"
+FG_ANSI = [f"{ESC}[38;5;{color}m" for color in range(256)]   # precomputed 256-color sequences
+BG_ANSI = [f"{ESC}[48;5;{color}m" for color in range(256)]
 
 logger = logging.getLogger(__name__)
 match_youtube = re.compile(r"(?:https?:\/\/)?(?:www\.)?(?:youtube\.com\/(?:watch\?v=|embed\/|shorts\/)|youtu\.be\/)[a-zA-Z0-9_-]{11}")
@@ -65,154 +70,177 @@ def volume_to_gain(volume):
 
 def img_to_term(img, img_gray, bg_color, ascii_palette, ascii_palette_len, screen_width, screen_height, img_width, img_height):
     """Convert image to ANSI-colored string made of ascii_palette, ready be printed in terminal"""
-    pixels = img.load()
-    pixels_gray = img_gray.load()
+    colors = np.asarray(img, dtype=np.uint8).astype(np.int16) + 16
+    gray = np.asarray(img_gray, dtype=np.uint8)
+
+    # map all gray values to palette characters through 256-entry lookup, then decode whole image text in one go
+    ascii_codes = np.array([ord(ch) for ch in ascii_palette], dtype="<u4")
+    gray_lut = ascii_codes[(np.arange(256) * ascii_palette_len) // 255]
+    chars = gray_lut[gray].tobytes().decode("utf-32-le")
 
     padding_h = (screen_height - img_height) // 2
     padding_w = (screen_width - img_width) // 2
+    right_pad_len = screen_width - padding_w - img_width
 
     bg = f"{ESC}[48;5;{bg_color}m"
-    out_lines = []
+    blank_line = bg + (" " * screen_width) + RESET + "\n"
+    left_padding = bg + (" " * padding_w)
+    right_padding = bg + (" " * right_pad_len)
+    out = []   # whole frame, joined only once
 
     # top padding
     for _ in range(padding_h):
-        out_lines.append(bg + (" " * screen_width) + RESET)
+        out.append(blank_line)
 
     # image rows
     for y in range(img_height):
-        line_parts = []
-        current_fg = None
-
         # left padding
         if padding_w > 0:
-            line_parts.append(bg + (" " * padding_w))
-
-        # image columns
-        for x in range(img_width):
-            gray_val = pixels_gray[x, y]
-            color = pixels[x, y] + 16
-            if color != current_fg:
-                line_parts.append(f"{ESC}[38;5;{color}m")
-                current_fg = color
-            line_parts.append(ascii_palette[(gray_val * ascii_palette_len) // 255])
+            out.append(left_padding)
+
+        # image columns, emitting fg color only where it changes
+        if img_width:
+            row = colors[y]
+            row_start = y * img_width
+            starts = np.flatnonzero(row[1:] != row[:-1]) + 1
+            start = 0
+            for end, color in zip((*starts.tolist(), img_width), row[np.r_[0, starts]].tolist()):
+                out.append(FG_ANSI[color])
+                out.append(chars[row_start + start:row_start + end])
+                start = end
 
         # right padding
-        visible_len = padding_w + img_width
-        if visible_len < screen_width:
-            line_parts.append(bg + (" " * (screen_width - visible_len)))
-
-        line_parts.append(RESET)
-        out_lines.append("".join(line_parts))
+        if right_pad_len > 0:
+            out.append(right_padding)
+        out.append(RESET + "\n")
 
     # bottom padding
-    while len(out_lines) < screen_height:
-        out_lines.append(bg + (" " * screen_width) + RESET)
+    for _ in range(screen_height - max(padding_h, 0) - img_height):
+        out.append(blank_line)
 
-    return "\n".join(out_lines)
+    return "".join(out)[:-1]
 
 
 def img_to_term_block(data, bg_color, screen_width, screen_height, img_width, img_height):
     """Convert image to ANSI-colored string made of half-blocks, ready to be printed in terminal"""
     padding_h = (screen_height - img_height // 2) // 2
     padding_w = (screen_width - img_width) // 2
+    right_pad_len = screen_width - padding_w - img_width
 
     bg = f"{ESC}[48;5;{bg_color}m"
-    out_lines = []
+    blank_line = bg + (" " * screen_width) + RESET + "\n"
+    left_padding = bg + (" " * padding_w)
+    right_padding = bg + (" " * right_pad_len)
+    out = []   # whole frame, joined only once
 
     # top padding
     for _ in range(padding_h):
-        out_lines.append(bg + (" " * screen_width) + RESET)
+        out.append(blank_line)
 
-    # image rows
-    for y in range(0, img_height - 1, 2):
-        line_parts = []
-        current_fg = None
-        current_bg = None
+    # split palette indices into top and bottom half-block rows
+    pairs = img_height // 2
+    indices = np.frombuffer(data, dtype=np.uint8).reshape(img_height, img_width)
+    top = indices[0:pairs * 2:2]
+    bot = indices[1:pairs * 2:2]
 
+    # image rows
+    for y in range(pairs):
         # left padding
         if padding_w > 0:
-            line_parts.append(bg + (" " * padding_w))
-
-        # image columns
-        for x in range(img_width):
-            top_color = data[y * img_width + x] + 16
-            bot_color = data[(y + 1) * img_width + x] + 16
-            if top_color != current_fg:
-                line_parts.append(f"{ESC}[38;5;{top_color}m")
-                current_fg = top_color
-            if bot_color != current_bg:
-                line_parts.append(f"{ESC}[48;5;{bot_color}m")
-                current_bg = bot_color
-            line_parts.append("▀")
+            out.append(left_padding)
+
+        # image columns, emitting colors only where they change
+        if img_width:
+            row_top, row_bot = top[y], bot[y]
+            fg_change = np.ones(img_width, dtype=bool)
+            bg_change = np.ones(img_width, dtype=bool)
+            np.not_equal(row_top[1:], row_top[:-1], out=fg_change[1:])
+            np.not_equal(row_bot[1:], row_bot[:-1], out=bg_change[1:])
+            points = np.flatnonzero(fg_change | bg_change).tolist()
+            fg_points = fg_change[points].tolist()
+            bg_points = bg_change[points].tolist()
+            fg_colors = row_top[points].tolist()
+            bg_colors = row_bot[points].tolist()
+            points.append(img_width)
+            for num, x in enumerate(points[:-1]):
+                if fg_points[num]:
+                    out.append(FG_ANSI[fg_colors[num] + 16])
+                if bg_points[num]:
+                    out.append(BG_ANSI[bg_colors[num] + 16])
+                out.append("▀" * (points[num + 1] - x))
 
         # right padding
-        visible_len = padding_w + img_width
-        if visible_len < screen_width:
-            line_parts.append(bg + (" " * (screen_width - visible_len)))
-
-        line_parts.append(RESET)
-        out_lines.append("".join(line_parts))
+        if right_pad_len > 0:
+            out.append(right_padding)
+        out.append(RESET + "\n")
 
     # bottom padding
-    while len(out_lines) < screen_height:
-        out_lines.append(bg + (" " * screen_width) + RESET)
-    return "\n".join(out_lines)
+    for _ in range(screen_height - max(padding_h, 0) - img_height // 2):
+        out.append(blank_line)
+
+    return "".join(out)[:-1]
 
 
 def img_to_term_block_truecolor(data, bg_color, screen_width, screen_height, img_width, img_height):
     """Convert image to ANSI true-color string made of half-blocks"""
     padding_h = (screen_height - img_height // 2) // 2
     padding_w = (screen_width - img_width) // 2
+    right_pad_len = screen_width - padding_w - img_width
 
     bgr = f"{ESC}[48;5;{bg_color}m"   # bg color is not in r;g;b
-    out_lines = []
+    blank_line = bgr + (" " * screen_width) + RESET + "\n"
+    left_padding = bgr + (" " * padding_w)
+    right_padding = bgr + (" " * right_pad_len)
+    out = []   # whole frame, joined only once
 
     # top padding
     for _ in range(padding_h):
-        out_lines.append(bgr + (" " * screen_width) + RESET)
+        out.append(blank_line)
 
-    # image rows
-    for y in range(0, img_height - 1, 2):
-        line_parts = []
-        cfr, cfg, cfb = None, None, None
-        cbr, cbg, cbb = None, None, None
+    # split rgb data into top and bottom half-block rows
+    pairs = img_height // 2
+    rgb = np.frombuffer(data, dtype=np.uint8).reshape(img_height, img_width, 3)
+    top = rgb[0:pairs * 2:2]
+    bot = rgb[1:pairs * 2:2]
 
+    # image rows
+    for y in range(pairs):
         # left padding
         if padding_w > 0:
-            line_parts.append(bgr + (" " * padding_w))
-
-        # image columns
-        row_top = y * img_width * 3
-        for x in range(img_width):
-            idx = row_top + x * 3
-            fr = data[idx]
-            fg = data[idx + 1]
-            fb = data[idx + 2]
-            idx += img_width * 3
-            br = data[idx]
-            bg = data[idx + 1]
-            bb = data[idx + 2]
-            if fr != cfr or fg != cfg or fb != cfb:
-                line_parts.append(f"{ESC}[38;2;{fr};{fg};{fb}m")
-                cfr, cfg, cfb = fr, fg, fb
-            if br != cbr or bg != cbg or bb != cbb:
-                line_parts.append(f"{ESC}[48;2;{br};{bg};{bb}m")
-                cbr, cbg, cbb = br, bg, bb
-            line_parts.append("▀")
+            out.append(left_padding)
+
+        # image columns, emitting colors only where they change
+        if img_width:
+            row_top, row_bot = top[y], bot[y]
+            fg_change = np.ones(img_width, dtype=bool)
+            bg_change = np.ones(img_width, dtype=bool)
+            np.any(row_top[1:] != row_top[:-1], axis=1, out=fg_change[1:])
+            np.any(row_bot[1:] != row_bot[:-1], axis=1, out=bg_change[1:])
+            points = np.flatnonzero(fg_change | bg_change).tolist()
+            fg_points = fg_change[points].tolist()
+            bg_points = bg_change[points].tolist()
+            fg_colors = row_top[points].tolist()
+            bg_colors = row_bot[points].tolist()
+            points.append(img_width)
+            for num, x in enumerate(points[:-1]):
+                if fg_points[num]:
+                    fr, fg, fb = fg_colors[num]
+                    out.append(f"{ESC}[38;2;{fr};{fg};{fb}m")
+                if bg_points[num]:
+                    br, bg, bb = bg_colors[num]
+                    out.append(f"{ESC}[48;2;{br};{bg};{bb}m")
+                out.append("▀" * (points[num + 1] - x))
 
         # right padding
-        visible_len = padding_w + img_width
-        if visible_len < screen_width:
-            line_parts.append(bgr + (" " * (screen_width - visible_len)))
-
-        line_parts.append(RESET)
-        out_lines.append("".join(line_parts))
+        if right_pad_len > 0:
+            out.append(right_padding)
+        out.append(RESET + "\n")
 
     # bottom padding
-    while len(out_lines) < screen_height:
-        out_lines.append(bgr + (" " * screen_width) + RESET)
+    for _ in range(screen_height - max(padding_h, 0) - pairs):
+        out.append(blank_line)
 
-    return "\n".join(out_lines)
+    return "".join(out)[:-1]
 
 
 # use cython if available, ~5 times faster
@@ -264,12 +292,19 @@ class TerminalMedia():
         self.external = external
         if external:
             signal.signal(signal.SIGINT, self.sigint_handler)
-        self.ascii_palette_len = len(self.ascii_palette) - 1
+        # expand palette so each gray value indexes its character directly: (gray * 255) // 255 == gray
+        ascii_palette_len = len(self.ascii_palette) - 1
+        self.ascii_palette = [self.ascii_palette[(gray * ascii_palette_len) // 255] for gray in range(256)]
+        self.ascii_palette_len = 255
         self.xterm_256_palette = xterm256.palette_short
+        self.img_palette = Image.new("P", (16, 16))   # reused for quantizing every frame
+        self.img_palette.putpalette(self.xterm_256_palette)
         self.run = False
         self.playing = False
         self.ended = False
         self.pause = False
+        self.unpaused = threading.Event()   # set while not paused, players wait on it
+        self.unpaused.set()
         self.pause_after_seek = False
         self.path = None
         self.media_type = None
@@ -280,6 +315,7 @@ class TerminalMedia():
         self.frame_h, self.frame_w = None, None
         self.screen_height, self.screen_width = 0, 0
         self.img = None
+        self.blank_screen = (None, None)   # (screen_size, string)
         self.ui = ui
         self.ui_line = None
         if ui:
@@ -299,6 +335,15 @@ class TerminalMedia():
         self.times = []
 
 
+    def set_pause(self, pause):
+        """Set pause state, waking up players when unpaused"""
+        self.pause = pause
+        if pause:
+            self.unpaused.clear()
+        else:
+            self.unpaused.set()
+
+
     def sigint_handler(self, _signum, _frame):
         """Handling Ctrl-C event"""
         self.stop_playback()
@@ -355,7 +400,7 @@ class TerminalMedia():
             height, width = self.frame_h, self.frame_w
         else:
             screen_height, screen_width = terminal_utils.get_size()
-            height, width = terminal_utils.get_size()
+            height, width = screen_height, screen_width
             wpercent = width / (img.size[0] * self.font_ratio)
             hsize = int(img.size[1] * wpercent)
             if hsize > height:
@@ -365,7 +410,7 @@ class TerminalMedia():
             else:
                 height = hsize
 
-            img = img.resize((width, height), Image.Resampling.LANCZOS)
+            img = img.resize((width, height), Image.Resampling.LANCZOS, reducing_gap=REDUCING_GAP)
         img_gray = img.convert("L")
 
         # increase saturation
@@ -380,9 +425,8 @@ class TerminalMedia():
             img = background
 
         # apply xterm256 palette
-        img_palette = Image.new("P", (16, 16))
-        img_palette.putpalette(self.xterm_256_palette)
-        img = img.quantize(palette=img_palette, dither=0)
+        # pillow caches nearest palette colors in C, measured faster than closed-form color cube lookup in numpy
+        img = img.quantize(palette=self.img_palette, dither=0)
 
         # draw
         string = img_to_term(
@@ -396,9 +440,10 @@ class TerminalMedia():
             width,
             height,
         )
-        if self.ui_line:
-            string = string[:string.rfind("\n") + 1] + f"\n{ESC}[48;5;{self.bg_color}m{self.ui_line}{RESET}"
-        terminal_utils.draw(string)
+        if self.ui_line:   # draw ui over last line, without copying whole frame
+            terminal_utils.draw(string, f"{ESC}[{screen_height};1H{ESC}[48;5;{self.bg_color}m{self.ui_line}{RESET}")
+        else:
+            terminal_utils.draw(string)
 
 
     def pil_img_to_term_block(self, img, remove_alpha=True):
@@ -420,7 +465,7 @@ class TerminalMedia():
             else:
                 height = hsize
             height &= ~1   # must be even height
-            img = img.resize((width, height), Image.Resampling.LANCZOS)
+            img = img.resize((width, height), Image.Resampling.LANCZOS, reducing_gap=REDUCING_GAP)
 
         # remove alpha
         if remove_alpha and img.mode == "RGBA":
@@ -433,9 +478,7 @@ class TerminalMedia():
             img = img.convert("RGB")
         else:
             # apply xterm256 palette
-            img_palette = Image.new("P", (16, 16))
-            img_palette.putpalette(self.xterm_256_palette)
-            img = img.quantize(palette=img_palette, dither=0)
+            img = img.quantize(palette=self.img_palette, dither=0)
 
         # draw
         string = self.img_to_term_block(   # truecolor is selected at init
@@ -446,20 +489,24 @@ class TerminalMedia():
             width,
             height,
         )
-        if self.ui_line:
-            string = string[:string.rfind("\n") + 1] + f"{ESC}[48;5;{self.bg_color}m{self.ui_line}{RESET}"
-        terminal_utils.draw(string)
+        if self.ui_line:   # draw ui over last line, without copying whole frame
+            terminal_utils.draw(string, f"{ESC}[{screen_height};1H{ESC}[48;5;{self.bg_color}m{self.ui_line}{RESET}")
+        else:
+            terminal_utils.draw(string)
 
 
     def draw_blank(self):
         """Fill screen with bg_color"""
         screen_size = terminal_utils.get_size()
         bg = f"{ESC}[48;5;{self.bg_color}m"
-        line = bg + (" " * screen_size[1]) + RESET
-        string = "\n".join(line for _ in range(screen_size[0]))
+        if self.blank_screen[0] != screen_size:   # rebuild only when screen is resized
+            line = bg + (" " * screen_size[1]) + RESET
+            self.blank_screen = (screen_size, "\n".join(line for _ in range(screen_size[0])))
+        string = self.blank_screen[1]
         if self.ui_line:
-            string += f"\n{bg}{self.ui_line}{RESET}"
-        terminal_utils.draw(string)
+            terminal_utils.draw(string, f"{ESC}[{screen_size[0]};1H{bg}{self.ui_line}{RESET}")
+        else:
+            terminal_utils.draw(string)
 
 
     def play_img(self, img_path):
@@ -470,10 +517,13 @@ class TerminalMedia():
             self.play_animated(img_path)
             return
         self.hide_ui()
+        # let jpeg decoder downscale while decoding, with margin for terminal resizing
+        self.screen_height, self.screen_width = terminal_utils.get_size()
+        img.draft("RGB", (self.screen_width * 2, self.screen_height * 4))
         self.pil_img_to_term(img)
         while self.run:
             h, w = terminal_utils.get_size()
-            if self.screen_height != h or self.screen_height != w:
+            if self.screen_height != h or self.screen_width != w:
                 self.screen_height, self.screen_width = h, w
                 self.pil_img_to_term(img)
             time.sleep(0.1)
@@ -491,18 +541,18 @@ class TerminalMedia():
         loop = bool(gif.info.get("loop", 1))
         frame = 0
         while self.playing:
-            start_time = time.time()
+            start_time = time.perf_counter()
 
             h, w = terminal_utils.get_size()
             if self.screen_height != h or self.screen_width != w:
                 self.calculate_image_size_anim(img_h, img_w)
                 frames = []
+                frame_canvas = Image.new("RGB", gif.size)   # reused, resize creates new image anyway
                 try:
                     gif.seek(0)
                     while True:
-                        frame_canvas = Image.new("RGB", gif.size)
                         frame_canvas.paste(gif)
-                        frames.append(frame_canvas.resize((self.frame_w, self.frame_h), Image.Resampling.LANCZOS))
+                        frames.append(frame_canvas.resize((self.frame_w, self.frame_h), Image.Resampling.LANCZOS, reducing_gap=REDUCING_GAP))
                         gif.seek(gif.tell() + 1)
                 except EOFError:
                     pass
@@ -520,7 +570,7 @@ class TerminalMedia():
                 if loop:
                     break
                 frame = 0
-            time.sleep(max(frame_duration - (time.time() - start_time), 0))
+            time.sleep(max(frame_duration - (time.perf_counter() - start_time), 0))
 
 
     def play_audio(self, path, loop=False, loop_delay=0.7, loop_max=60):
@@ -540,18 +590,17 @@ class TerminalMedia():
         audio_stream = all_audio_streams[0]
 
         with speaker.player(samplerate=audio_stream.rate, channels=audio_stream.channels, blocksize=1152) as stream:
-            start = int(time.time())
+            start = time.monotonic()
             while self.playing:
                 for frame in container.decode(audio=0):
                     if not self.playing:
                         break
-                    while self.pause:
-                        time.sleep(0.1)
+                    self.unpaused.wait()
                     audio = frame.to_ndarray().astype("float32").T
                     audio *= self.gain
                     stream.play(audio)
                 if loop:
-                    if int(time.time()) - start > loop_max:
+                    if time.monotonic() - start > loop_max:
                         break
                     time.sleep(loop_delay)
                     container.seek(0)
@@ -565,7 +614,7 @@ class TerminalMedia():
         self.ui = False
         self.playing = True
         self.run = True
-        self.pause = False
+        self.set_pause(False)
         self.player_thread = threading.Thread(target=self.play_audio, daemon=True, args=(path, loop, loop_delay, loop_max))
         self.player_thread.start()
 
@@ -574,7 +623,7 @@ class TerminalMedia():
         """Stop all playbacks immediately"""
         self.clear_queues()
         self.screen_height, self.screen_width = 0, 0
-        self.pause = False
+        self.set_pause(False)
         self.run = False
         self.playing = False
 
@@ -588,40 +637,45 @@ class TerminalMedia():
 
 
     def audio_player(self, audio_queue, samplerate, channels, audio_ready):
-        """Play audio frames from the queue"""
+        """Play audio samples (already converted to float32 arrays) from the queue"""
         with speaker.player(samplerate=samplerate, channels=channels, blocksize=1152) as stream:
             audio_ready.set()
             while self.run:
-                frame = audio_queue.get()
-                if frame is None:
+                audio = audio_queue.get()
+                if audio is None:
                     break
-                audio = frame.to_ndarray().astype("float32").T
                 audio *= self.gain
                 stream.play(audio)
-                while self.pause:
-                    time.sleep(0.1)
+                self.unpaused.wait()
 
 
     def video_player(self, video_queue, audio_queue, frame_duration, no_audio=False):
         """Play video frames from the queue"""
+        last_drawn = None
         while self.run:
             frame = video_queue.get()
             if frame is None:
                 break
             if audio_queue.qsize() >= 1 or no_audio:
-                start_time = time.time()
-                self.img = frame.to_image()
-                try:
-                    self.pil_img_to_term(self.img, remove_alpha=False)
-                except IndexError:
-                    pass
+                start_time = time.perf_counter()
+                # skip drawing if frame, ui and screen are same as last drawn
+                frame_hash = 1
+                for plane in frame.planes:
+                    frame_hash = zlib.adler32(plane, frame_hash)
+                drawn = (frame_hash, self.ui_line, self.screen_height, self.screen_width)
+                if drawn != last_drawn:
+                    last_drawn = drawn
+                    self.img = frame.to_image()
+                    try:
+                        self.pil_img_to_term(self.img, remove_alpha=False)
+                    except IndexError:
+                        pass
                 h, w = terminal_utils.get_size()
                 if self.screen_height != h or self.screen_width != w:
                     self.calculate_image_size()
             if audio_queue.qsize() >= 3 or no_audio:
-                time.sleep(max(frame_duration - (time.time() - start_time), 0))
-            while self.pause:
-                time.sleep(0.1)
+                time.sleep(max(frame_duration - (time.perf_counter() - start_time), 0))
+            self.unpaused.wait()
 
 
     def play_video(self, path, loop=False):
@@ -668,30 +722,37 @@ class TerminalMedia():
         video_thread = threading.Thread(target=self.video_player, args=(self.video_queue, self.audio_queue, frame_duration, not (have_audio)), daemon=True)
         video_thread.start()
 
+        # decode only streams that are played
+        streams = (video_stream, audio_stream) if have_audio else (video_stream, )
+
         while self.playing:
             num = 0
-            for frame in container.decode():
+            for frame in container.decode(*streams):
                 if self.seek is not None:
                     container.seek(int(self.seek / video_stream.time_base), stream=video_stream)
                     self.video_time = self.seek
                     self.seek = None
                     if self.pause_after_seek:
                         self.pause_after_seek = False
-                        self.pause = True
+                        self.set_pause(True)
                         self.ui_line = self.build_ui_string()
                         self.show_ui()
                     continue
                 if not self.playing:
                     container.close()
                     break
-                while self.pause:
-                    time.sleep(0.1)
+                self.unpaused.wait()
                 if self.pause_after_seek:
                     continue
                 if isinstance(frame, av.audio.frame.AudioFrame) and have_audio:
-                    self.audio_queue.put(frame)
+                    self.audio_queue.put(frame.to_ndarray().astype("float32").T)   # convert here to keep audio thread light
                 if isinstance(frame, av.video.frame.VideoFrame):
                     if num == frame_index:   # limit fps
+                        if have_audio and self.video_queue.full():   # drawing is behind, drop oldest frame so audio keeps flowing
+                            try:
+                                self.video_queue.get_nowait()
+                            except Empty:
+                                pass
                         self.video_queue.put(frame.reformat(height=self.frame_h, width=self.frame_w))
                         num = 0
                     num += 1
@@ -747,7 +808,10 @@ class TerminalMedia():
         input_thread = threading.Thread(target=self.wait_input, daemon=True)
         input_thread.start()
         try:
-            yt_match = re.search(match_youtube, path)
+            if "youtu" in path:   # skip regex for local files
+                yt_match = match_youtube.search(path)
+            else:
+                yt_match = None
             if yt_match:
                 self.play_youtube(yt_match.group())
             elif "https://" in path:
@@ -808,10 +872,10 @@ class TerminalMedia():
             self.stop_playback()
         elif code == 101 and self.media_type in ("audio", "video"):   # pause
             self.show_ui()
-            self.pause = not self.pause
+            self.set_pause(not self.pause)
         elif code == 102 and self.media_type in ("audio", "video"):   # replay
             self.show_ui()
-            self.pause = False
+            self.set_pause(False)
             self.seek = 0
             if self.ended:
                 self.show_ui()
@@ -826,14 +890,14 @@ class TerminalMedia():
             self.show_ui()
             self.clear_queues()
             if self.pause:
-                self.pause = False
+                self.set_pause(False)
                 self.pause_after_seek = True
             self.seek = min(self.video_time + 5, self.video_duration)
         elif code == 104 and self.media_type in ("audio", "video") and not self.ended:   # seek backward
             self.show_ui()
             self.clear_queues()
             if self.pause:
-                self.pause = False
+                self.set_pause(False)
                 self.pause_after_seek = True
             self.seek = max(self.video_time - 5, 0)
         elif code == 105 and self.media_type in ("audio", "video"):   # volume up
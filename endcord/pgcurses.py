@@ -15,6 +15,8 @@ import pygame
 import pygame.freetype
 from pygame._sdl2 import Window as pg_Window
 
+from endcord.utils import POTENTIAL_EMOJI_CHARS
+
 if sys.platform.startswith("android"):
     sys.platform = "linux"
 if "bsd" in sys.platform:
@@ -301,13 +303,7 @@ def xterm_to_rgb(x):
 
 def is_emoji(ch):
     """Check if character is emoji"""
-    code = ord(ch)
-    return (
-        0x1F300 <= code <= 0x1F9FF or
-        0x2600 <= code <= 0x27BF or
-        0x2300 <= code <= 0x23FF or
-        0x2B00 <= code <= 0x2BFF
-    )
+    return ch in POTENTIAL_EMOJI_CHARS
 
 
 def map_key(event):
@@ -2,7 +2,10 @@
 # Source-available under the Endcord License. See LICENSE for terms.
 # Redistribution of modified versions is not permitted.
 
+import atexit
 import curses
+import functools
+import importlib.util
 import json
 import logging
 import os
@@ -12,7 +15,6 @@ import subprocess
 import sys
 import threading
 import time
-from datetime import datetime
 
 if sys.platform == "win32":
     import pywintypes
@@ -24,6 +26,14 @@ if sys.platform.startswith("android"):
     sys.platform = "linux"
 if "bsd" in sys.platform:
     sys.platform = "linux"
+# secretstorage talks to secret service over dbus in-process, without spawning secret-tool
+have_secretstorage = sys.platform == "linux" and importlib.util.find_spec("secretstorage") is not None
+
+try:
+    import orjson
+    have_orjson = True
+except ImportError:
+    have_orjson = False
 
 try:
     import __main__
@@ -131,7 +141,11 @@ TOTP_PROMPT_TEXT = f""" Enter the code from your TOTP authenticator app here.
 """
 CAPTCHA_REQUIRED_TEXT = (UNABLE_LOGIN_TEXT, "Captcha is required.", "Login with official client first over this IP, then try again.", "", ANY_KEY_TEXT)
 FAILED_AUTH_INIT_TEXT = ("Failed starting authentication gateway.", 'Either use "Paste token" method or use endcord level=MINI or above.', "", ANY_KEY_TEXT)
+SECRET_CACHE_TTL = 30   # revoked token can be loaded from cache for at most this many seconds
 logger = logging.getLogger(__name__)
+secret_cache = {"value": None, "expires": 0}
+dbus_connection = None
+dbus_lock = threading.Lock()
 
 
 def setup_secret_service():
@@ -149,6 +163,17 @@ def setup_secret_service():
                     os.environ[key] = value
 
         # ensure secret service is running
+        if have_secretstorage:
+            import secretstorage
+            with dbus_lock:
+                try:
+                    available = secretstorage.check_service_availability(get_dbus_connection())
+                except secretstorage.SecretStorageException:
+                    close_dbus_connection()
+                    available = False
+            if not available:
+                logger.warning("Cant use keyring: Secret Service Provider is not available, it is probably not installed")
+            return available
         result = subprocess.run(
             ["secret-tool", "lookup", "service", "keyring-check"],
             stdout=subprocess.DEVNULL,
@@ -166,14 +191,65 @@ def setup_secret_service():
     return True
 
 
+def get_dbus_connection():
+    """Get persistent dbus connection used by secretstorage, connecting on first use"""
+    global dbus_connection
+    if dbus_connection is None:
+        import secretstorage
+        dbus_connection = secretstorage.dbus_init()
+    return dbus_connection
+
+
+def close_dbus_connection():
+    """Close persistent dbus connection, it will be reopened on next use"""
+    global dbus_connection
+    if dbus_connection is not None:
+        dbus_connection.close()
+        dbus_connection = None
+
+
+atexit.register(close_dbus_connection)
+
+
+def get_secret_items(connection):
+    """Get keyring items belonging to this app using secretstorage, unlocking them if needed"""
+    import secretstorage
+    items = list(secretstorage.search_items(connection, {"service": APP_NAME}))
+    for item in items:
+        if item.is_locked():
+            item.unlock()
+    return items
+
+
 def load_secret():
-    """Try to load profiles from system keyring"""
+    """Try to load profiles from system keyring, cached for SECRET_CACHE_TTL seconds"""
+    if time.monotonic() < secret_cache["expires"]:
+        return secret_cache["value"]
+    profiles = read_secret()
+    secret_cache["value"] = profiles
+    secret_cache["expires"] = time.monotonic() + SECRET_CACHE_TTL
+    return profiles
+
+
+def read_secret():
+    """Read profiles json from system keyring, as bytes where keyring provides them"""
     if sys.platform == "linux":
+        if have_secretstorage:
+            import secretstorage
+            with dbus_lock:
+                try:
+                    items = get_secret_items(get_dbus_connection())
+                    if items:
+                        return items[0].get_secret().strip()
+                except secretstorage.SecretStorageException as e:
+                    logger.error(f"secretstorage error: {e}")
+                    close_dbus_connection()
+            return "[]"
         try:
             result = subprocess.run([
                 "secret-tool", "lookup",
                 "service", APP_NAME,
-                ], capture_output=True, text=True, check=True,
+                ], capture_output=True, check=True,
             )
             return result.stdout.strip()
         except subprocess.CalledProcessError:
@@ -203,14 +279,27 @@ def load_secret():
 
 
 def save_secret(profiles):
-    """Save profiles to system keyring"""
+    """Save profiles json bytes to system keyring"""
+    secret_cache["expires"] = 0
     if sys.platform == "linux":
+        if have_secretstorage:
+            import secretstorage
+            with dbus_lock:
+                try:
+                    collection = secretstorage.get_default_collection(get_dbus_connection())
+                    if collection.is_locked():
+                        collection.unlock()
+                    collection.create_item(f"{APP_NAME} profiles", {"service": APP_NAME}, profiles, replace=True)
+                except secretstorage.SecretStorageException as e:
+                    logger.error(f"secretstorage error: {e}")
+                    close_dbus_connection()
+            return
         try:
             subprocess.run([
                 "secret-tool", "store",
                 "--label=" + f"{APP_NAME} profiles",
                 "service", APP_NAME,
-                ], input=profiles.encode(), check=True,
+                ], input=profiles, check=True,
             )
         except subprocess.CalledProcessError as e:
             logger.error(f"secret-tool error: {e}")
@@ -220,7 +309,7 @@ def save_secret(profiles):
             win32cred.CredWrite({
                 "Type": win32cred.CRED_TYPE_GENERIC,
                 "TargetName": f"{APP_NAME} profiles",
-                "CredentialBlob": profiles,
+                "CredentialBlob": profiles.decode("utf-8"),
                 "Persist": win32cred.CRED_PERSIST_LOCAL_MACHINE,
             }, 0)
         except pywintypes.error as e:
@@ -232,7 +321,7 @@ def save_secret(profiles):
             "security", "add-generic-password",
             "-s", APP_NAME,
             "-a", "profiles",
-            "-w", profiles,
+            "-w", profiles.decode("utf-8"),
             "-U",
             ], check=True,
         )
@@ -240,7 +329,17 @@ def save_secret(profiles):
 
 def remove_secret():
     """Remove profiles from system keyring"""
+    secret_cache["expires"] = 0
     if sys.platform == "linux":
+        if have_secretstorage:
+            import secretstorage
+            with dbus_lock:
+                try:
+                    for item in get_secret_items(get_dbus_connection()):
+                        item.delete()
+                except secretstorage.SecretStorageException:
+                    close_dbus_connection()
+            return
         try:
             subprocess.run([
                 "secret-tool", "clear",
@@ -268,14 +367,28 @@ def remove_secret():
         )
 
 
+def dump_json(data, indent=False):
+    """Serialize data to json bytes, using orjson if its available"""
+    if have_orjson:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else None)
+    return json.dumps(data, indent=2 if indent else None).encode("utf-8")
+
+
+def load_json(data):
+    """Deserialize json str or bytes, using orjson if its available"""
+    if have_orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 def load_plain(profiles_path):
     """Load profiles from plaintext file"""
     path = os.path.expanduser(profiles_path)
-    if not os.path.exists(path):
-        return []
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(path, "rb") as f:
+            return load_json(f.read())
+    except FileNotFoundError:
+        return []
     except Exception:
         logger.warning("Invalid profiles.json file")
         return []
@@ -284,15 +397,18 @@ def load_plain(profiles_path):
 def save_plain(profiles, profiles_path):
     """Save profiles to plaintext file"""
     path = os.path.expanduser(profiles_path)
-    if not os.path.exists(path):
-        os.makedirs(os.path.dirname(path), exist_ok=True)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"   # write to temp file then replace, so crash cant leave it half-written
     if sys.platform == "linux":
-        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
-        with os.fdopen(fd, "w") as f:
-            json.dump(profiles, f, indent=2)
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        f = os.fdopen(fd, "wb")
     else:
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(profiles, f, indent=2)
+        f = open(tmp_path, "wb")
+    with f:
+        f.write(dump_json(profiles, indent=True))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
 
 
 def remove_plain(profiles_path):
@@ -302,6 +418,7 @@ def remove_plain(profiles_path):
         os.remove(path)
 
 
+@functools.lru_cache(maxsize=32)
 def get_prompt_y(width, text, index_back):
     """Get prompt y position from length of text and terminal width"""
     lines = text.split("\n")
@@ -313,19 +430,15 @@ def get_prompt_y(width, text, index_back):
 
 def pad_name(name, date, source, w):
     """Add spaces to name so string always fits max width"""
-    text = f" {name} {date:<{20}} {source:<{12}} "
-    extra_spaces = w - len(text)
-    if extra_spaces > 0:
-        name = name + " " * extra_spaces
-    return f" {name} {date:<{20}} {source:<{12}} "
+    tail = f" {date:<20} {source:<12} "
+    return f" {name.ljust(w - len(tail) - 1)}{tail}"
 
 
 def convert_time(unix_time):
     """Convert unix time to current time"""
     if unix_time:
-        time_obj = datetime.fromtimestamp(unix_time)
-        time_obj = time_obj.astimezone()
-        return datetime.strftime(time_obj, "%Y.%m.%d %H:%M")
+        t = time.localtime(unix_time)
+        return f"{t.tm_year:04d}.{t.tm_mon:02d}.{t.tm_mday:02d} {t.tm_hour:02d}:{t.tm_min:02d}"
     return "Unknown"
 
 
@@ -352,24 +465,35 @@ def init_auth(config):
     )
 
 
+def merge_profiles(profiles_enc, profiles_plain):
+    """Merge keyring and plaintext profiles into one list sorted by name, and format their dates"""
+    profiles = [
+        {**p, "source": "keyring"} for p in profiles_enc
+    ] + [
+        {**p, "source": "plaintext"} for p in profiles_plain
+    ]
+    profiles.sort(key=lambda x: x["name"])
+    dates = [convert_time(profile["time"]) for profile in profiles]
+    return profiles, dates
+
+
 def main_tui(screen, profiles_enc, profiles_plain, selected, have_keyring, config):
     """Main profile manager tui"""
     curses.use_default_colors()
     curses.curs_set(0)
     curses.init_pair(1, -1, -1)
     curses.init_pair(2, -1, 241)
+    color_normal = curses.color_pair(1)
+    color_selected = color_normal | curses.A_STANDOUT
 
-    screen.bkgd(" ", curses.color_pair(1))
-    screen.addstr(1, 0, MANAGER_TEXT, curses.color_pair(1))
+    screen.bkgd(" ", color_normal)
+    screen.addstr(1, 0, MANAGER_TEXT, color_normal)
     if not have_keyring:
-        screen.addstr(3, 0, NO_KEYRING_TEXT, curses.color_pair(1))
+        screen.addstr(3, 0, NO_KEYRING_TEXT, color_normal)
 
-    profiles = [
-        {**p, "source": "keyring"} for p in profiles_enc
-    ] + [
-        {**p, "source": "plaintext"} for p in profiles_plain
-    ]
-    profiles = sorted(profiles, key=lambda x: x["name"])
+    profiles, dates = merge_profiles(profiles_enc, profiles_plain)
+    enc_index = {profile["name"]: num for num, profile in enumerate(profiles_enc)}
+    plain_index = {profile["name"]: num for num, profile in enumerate(profiles_plain)}
 
     for num, profile in enumerate(profiles):
         if profile["name"] == selected:
@@ -378,24 +502,42 @@ def main_tui(screen, profiles_enc, profiles_plain, selected, have_keyring, confi
     else:
         selected_num = 0
     selected_button = 0
+    rows = None
+    list_pad = None
+    drawn_num = selected_num
 
     run = True
     proceed = False
     while run:
         regenerate = False
+        changed = False
         h, w = screen.getmaxyx()
-        title_text = pad_name("Name", "Last used", "Save method", w)
-        screen.addstr(4, 0, title_text, curses.color_pair(1) | curses.A_STANDOUT)
-
-        for num, profile in enumerate(profiles):
-            date = convert_time(profile["time"])
-            text = pad_name(profile["name"], date, profile["source"], w)
-            if num == selected_num:
-                screen.addstr(num + 5, 0, text, curses.color_pair(1) | curses.A_STANDOUT)
-            else:
-                screen.addstr(num + 5, 0, text, curses.color_pair(1))
+        if rows is None:
+            title_text = pad_name("Name", "Last used", "Save method", w)
+            screen.addstr(4, 0, title_text, color_selected)
+            rows = [pad_name(profile["name"], dates[num], profile["source"], w) for num, profile in enumerate(profiles)]
+            list_pad = curses.newpad(len(rows) + 1, w)   # +1 so writing last cell of last row wont fail
+            list_pad.bkgd(" ", color_normal)
+            for num, text in enumerate(rows):
+                if num == selected_num:
+                    list_pad.addstr(num, 0, text, color_selected)
+                else:
+                    list_pad.addstr(num, 0, text, color_normal)
+        elif drawn_num != selected_num:   # only selection moved
+            list_pad.addstr(drawn_num, 0, rows[drawn_num], color_normal)
+            list_pad.addstr(selected_num, 0, rows[selected_num], color_selected)
+        drawn_num = selected_num
         draw_buttons(screen, selected_button, h-1, w)
 
+        # profile list is scrolled so selected profile is always visible between title and buttons
+        screen.noutrefresh()
+        list_h = h - 6
+        if list_h > 0:
+            top = max(min(selected_num - list_h // 2, len(rows) - list_h), 0)
+            list_pad.touchwin()
+            list_pad.noutrefresh(top, 0, 5, 0, h - 2, w - 1)
+        curses.doupdate()
+
         key = screen.getch()
         if key == 27:   # escape key
             break
@@ -408,25 +550,20 @@ def main_tui(screen, profiles_enc, profiles_plain, selected, have_keyring, confi
                 profile, add = manage_profile(screen, have_keyring, config)
                 screen.clear()
                 if add:
-                    enc_source = profile.pop("source") == "keyring"
-                    if enc_source:
-                        for num, profile_s in enumerate(profiles_enc):
-                            if profile_s["name"] == profile["name"]:
-                                profiles_enc[num] = profile
-                        else:
-                            profiles_enc.append(profile)
+                    if profile.pop("source") == "keyring":
+                        target, index = profiles_enc, enc_index
                     else:
-                        for num, profile_s in enumerate(profiles_plain):
-                            if profile_s["name"] == profile["name"]:
-                                profiles_plain[num] = profile
-                        else:
-                            profiles_plain.append(profile)
+                        target, index = profiles_plain, plain_index
+                    num = index.get(profile["name"])
+                    if num is None:
+                        target.append(profile)
+                    else:   # replace profile with same name
+                        target[num] = profile
+                    changed = True
                 regenerate = True
             elif selected_button == 2 and profiles:   # EDIT
                 enc_source = profiles[selected_num]["source"] == "keyring"
-                for num, profile in enumerate(profiles_enc if enc_source else profiles_plain):
-                    if profile["name"] == profiles[selected_num]["name"]:
-                        break
+                num = (enc_index if enc_source else plain_index)[profiles[selected_num]["name"]]
                 profile, edit = manage_profile(screen, have_keyring, config, editing_profile=profiles[selected_num])
                 screen.clear()
                 if edit:
@@ -435,12 +572,14 @@ def main_tui(screen, profiles_enc, profiles_plain, selected, have_keyring, confi
                         profiles_enc[num] = profile
                     else:
                         profiles_plain[num] = profile
+                changed = True   # editing_profile is modified in place even if editing is canceled
                 regenerate = True
             elif selected_button == 3 and profiles:   # DELETE
                 profiles_enc, profiles_plain, deleted = delete_profile(screen, profiles_enc, profiles_plain, profiles[selected_num])
                 screen.clear()
                 if deleted and selected_num > 0:
                     selected_num -= 1
+                changed = deleted
                 regenerate = True
             elif selected_button == 4:   # QUIT
                 break
@@ -460,18 +599,15 @@ def main_tui(screen, profiles_enc, profiles_plain, selected, have_keyring, confi
             regenerate = True
 
         if regenerate:
-            screen.bkgd(" ", curses.color_pair(1))
-            screen.addstr(1, 0, MANAGER_TEXT, curses.color_pair(1))
+            screen.bkgd(" ", color_normal)
+            screen.addstr(1, 0, MANAGER_TEXT, color_normal)
             if not have_keyring:
-                screen.addstr(3, 0, NO_KEYRING_TEXT, curses.color_pair(1))
-            profiles = [
-                {**p, "source": "keyring"} for p in profiles_enc
-            ] + [
-                {**p, "source": "plaintext"} for p in profiles_plain
-            ]
-            profiles = sorted(profiles, key=lambda x: x["name"])
-
-        screen.refresh()
+                screen.addstr(3, 0, NO_KEYRING_TEXT, color_normal)
+            if changed:
+                profiles, dates = merge_profiles(profiles_enc, profiles_plain)
+                enc_index = {profile["name"]: num for num, profile in enumerate(profiles_enc)}
+                plain_index = {profile["name"]: num for num, profile in enumerate(profiles_plain)}
+            rows = None
 
     screen.clear()
     screen.refresh()
@@ -691,6 +827,7 @@ def manage_profile(screen, have_keyring, config, editing_profile=None):
                 key_prompt(screen, FAILED_AUTH_INIT_TEXT)
                 set_step(2, mem=False)
                 continue
+            # lazy, rarely used and auth deps can be missing
             from endcord import auth, client_properties, qr_code, terminal_utils
             if config["custom_user_agent"]:
                 user_agent = config["custom_user_agent"]
@@ -703,11 +840,18 @@ def manage_profile(screen, have_keyring, config, editing_profile=None):
                 gateway_auth.disconnect_ws()
                 set_step(2, mem=False)
                 continue
+
+            def detect_esc():
+                terminal_utils.esc_detector()
+                esc_detected.set()
+                gateway_auth.state_changed.set()   # wake up loop so esc is handled immediately
+            esc_detected = threading.Event()
+            drawn = None
             run = True
             drawing = False
             esc_detector = None
             while run:
-                if drawing and not esc_detector.is_alive():
+                if drawing and esc_detected.is_set():
                     set_step(2, mem=False)
                     break
                 state = gateway_auth.get_state()
@@ -727,13 +871,16 @@ def manage_profile(screen, have_keyring, config, editing_profile=None):
                         pause_curses()
                         terminal_utils.enter_tui()
                         if not esc_detector or not esc_detector.is_alive():
-                            esc_detector = threading.Thread(target=terminal_utils.esc_detector, daemon=True)
+                            esc_detected.clear()
+                            esc_detector = threading.Thread(target=detect_esc, daemon=True)
                             esc_detector.start()
                         drawing = True
                 elif state == 2:   # pending ticket
                     user_id, username = gateway_auth.get_user()
                     text = f"Waiting for verification. \nUsername:{username}\nUser ID: {user_id}\n " + timeout_text
-                    draw_text(screen, text, center=True)
+                    if text != drawn:
+                        draw_text(screen, text, center=True)
+                        drawn = text
                 elif state == 3:   # success
                     ticket = gateway_auth.get_ticket()
                     status, encrypted_token = discord_auth.exchange_ticket(ticket)
@@ -767,11 +914,14 @@ def manage_profile(screen, have_keyring, config, editing_profile=None):
                     set_step(2, mem=False)
                     break
                 if drawing:
-                    text_above = "Scan this QR code with your phone to login:"
                     text_bellow = url + "\n\n" + timeout_text + "\nEsc to go back."
-                    _, string = qr_code.gen_qr_terminal_string(url, text_above, text_bellow)
-                    terminal_utils.draw(string)
-                time.sleep(0.1)
+                    frame = (text_bellow, shutil.get_terminal_size())
+                    if frame != drawn:   # redraw only when text or terminal size changed
+                        text_above = "Scan this QR code with your phone to login:"
+                        _, string = qr_code.gen_qr_terminal_string(url, text_above, text_bellow, frame[1])
+                        terminal_utils.draw(string)
+                        drawn = frame
+                gateway_auth.wait_state(1)   # remaining time is updated once per second
             terminal_utils.stop_esc_detector()
 
         elif step == 900:   # save method
@@ -833,8 +983,9 @@ def text_prompt(screen, description_text, prompts, init=None, mask=None, prompt_
     base_y = get_prompt_y(w, description_text, prompt_idx_back)
     input_index = len(texts[selected])
 
-    def draw():
-        for i, prompt in enumerate(prompts):
+    def draw(indexes):
+        for i in indexes:
+            prompt = prompts[i]
             y = base_y + i * (1 + spacing)
             prompt_len = len(prompt) + 2
             text = texts[i]
@@ -855,11 +1006,12 @@ def text_prompt(screen, description_text, prompts, init=None, mask=None, prompt_
                 screen.addstr(y, 1, line, curses.color_pair(2))    # gray
         screen.refresh()
 
-    draw()
+    draw(range(len(prompts)))
 
     run = True
     proceed = False
     while run:
+        prev_selected = selected
         key = screen.getch()
 
         if key == 27:  # ESC
@@ -914,7 +1066,11 @@ def text_prompt(screen, description_text, prompts, init=None, mask=None, prompt_
             selected = (selected + 1) % len(prompts)
             input_index = len(texts[selected])
 
-        draw()
+        # only lines whose text, cursor or highlight could have changed
+        if selected == prev_selected:
+            draw((selected, ))
+        else:
+            draw((prev_selected, selected))
 
     screen.clear()
     screen.refresh()
@@ -929,24 +1085,26 @@ def select_prompt(screen, description_text, options, y_offset):
     """Prompt to select from given options"""
     screen.clear()
     screen.bkgd(" ", curses.color_pair(1))
-    h, w = screen.getmaxyx()
+    _, w = screen.getmaxyx()
     for num, line in enumerate(description_text):
         screen.addstr(num+1, 0, line.center(w), curses.color_pair(1))
     run = True
     proceed = False
     selected_num = 0
     longest = len(max(options, key=len)) + 2
+    texts = [option.center(longest) for option in options]
+    y = len(description_text) + y_offset
+    drawn = None
     while run:
-        y = len(description_text) + y_offset
-        h, w = screen.getmaxyx()
-        for num, option in enumerate(options):
-            text = option.center(longest)
+        _, w = screen.getmaxyx()
+        if (selected_num, w) != drawn:   # redraw only on selection or width change
             x_gap = (w - longest) // 2
-            if num == selected_num:
-                screen.addstr(y, x_gap, text, curses.color_pair(1) | curses.A_STANDOUT)
-            else:
-                screen.addstr(y, x_gap, text, curses.color_pair(1))
-            y += 1
+            for num, text in enumerate(texts):
+                if num == selected_num:
+                    screen.addstr(y + num, x_gap, text, curses.color_pair(1) | curses.A_STANDOUT)
+                else:
+                    screen.addstr(y + num, x_gap, text, curses.color_pair(1))
+            drawn = (selected_num, w)
 
         key = screen.getch()
 
@@ -965,7 +1123,6 @@ def select_prompt(screen, description_text, options, y_offset):
             if selected_num < len(options) - 1:
                 selected_num += 1
 
-        _, w = screen.getmaxyx()
         screen.refresh()
 
     screen.clear()
@@ -1045,21 +1202,25 @@ def resume_curses(screen):
 
 
 def update_time(profiles_enc, profiles_plain, profile_name):
-    """Update time for selected profile"""
+    """Update time for selected profile, return True if it changed"""
+    now = int(time.time()) // 60 * 60   # shown with minute precision, so relaunch within same minute wont need saving
     for profile in profiles_enc:
         if profile["name"] == profile_name:
-            profile["time"] = int(time.time())
-            return
+            changed = profile["time"] != now
+            profile["time"] = now
+            return changed
     for profile in profiles_plain:
         if profile["name"] == profile_name:
-            profile["time"] = int(time.time())
-            return
+            changed = profile["time"] != now
+            profile["time"] = now
+            return changed
+    return False
 
 
 def manage(profiles_path, external_selected, config, force_open=False):
     """Manage and return profiles and selected profile"""
     have_keyring = True
-    if sys.platform == "linux" and not shutil.which("secret-tool"):
+    if sys.platform == "linux" and not have_secretstorage and not shutil.which("secret-tool"):
         have_keyring = False
         logger.warning("Cant use keyring: 'libsecret' package is not installed")
 
@@ -1067,8 +1228,8 @@ def manage(profiles_path, external_selected, config, force_open=False):
     if have_keyring:
         profiles_enc = load_secret()
         try:
-            profiles_enc = json.loads(profiles_enc)
-        except json.JSONDecodeError:
+            profiles_enc = load_json(profiles_enc)
+        except ValueError:
             remove_secret()   # failsafe for remnants of old save method
             profiles_enc = None
         if not profiles_enc:
@@ -1084,14 +1245,24 @@ def manage(profiles_path, external_selected, config, force_open=False):
             selected = profiles_plain["selected"]
         profiles_plain = profiles_plain["profiles"]
 
+    # snapshot of stored profiles, so unchanged ones are not written again
+    saved_enc = dump_json({"selected": selected, "profiles": profiles_enc})
+    saved_plain = dump_json({"selected": selected, "profiles": profiles_plain})
+
+    def save():
+        enc_data = dump_json({"selected": selected, "profiles": profiles_enc})
+        if have_keyring and enc_data != saved_enc:
+            save_secret(enc_data)
+        plain_data = {"selected": selected, "profiles": profiles_plain}
+        if dump_json(plain_data) != saved_plain:
+            save_plain(plain_data, profiles_path)
+
     if external_selected:
         selected = external_selected
 
     if (bool(profiles_enc) or bool(profiles_plain)) and selected is not None and not force_open:
-        update_time(profiles_enc, profiles_plain, selected)
-        if have_keyring:
-            save_secret(json.dumps({"selected": selected, "profiles": profiles_enc}))
-        save_plain({"selected": selected, "profiles": profiles_plain}, profiles_path)
+        if update_time(profiles_enc, profiles_plain, selected) or external_selected:
+            save()
         profiles = {
             "selected": selected,
             "keyring": profiles_enc,
@@ -1119,18 +1290,14 @@ def manage(profiles_path, external_selected, config, force_open=False):
     if (bool(profiles_enc) or bool(profiles_plain)):
         if proceed:
             update_time(profiles_enc, profiles_plain, selected)
-        if have_keyring:
-            save_secret(json.dumps({"selected": selected, "profiles": profiles_enc}))
-        save_plain({"selected": selected, "profiles": profiles_plain}, profiles_path)
+        save()
         profiles = {
             "selected": selected,
             "keyring": profiles_enc,
             "plaintext": profiles_plain,
         }
         return profiles, selected, proceed
-    if have_keyring:
-        save_secret(json.dumps({"selected": selected, "profiles": profiles_enc}))
-    save_plain({"selected": selected, "profiles": profiles_plain}, profiles_path)
+    save()
     return None, None, False
 
 
@@ -1138,7 +1305,7 @@ def refresh_token(new_token, profile_name, profiles_path):
     """Refresh token for specified profile in keyring and plaintext"""
     try:
         profiles_enc = load_secret()
-        profiles_enc = json.loads(profiles_enc)
+        profiles_enc = load_json(profiles_enc)
         if profiles_enc:
             profiles_enc = profiles_enc["profiles"]
         else:
@@ -1150,24 +1317,23 @@ def refresh_token(new_token, profile_name, profiles_path):
     if profiles_plain:
         profiles_plain = profiles_plain["profiles"]
 
-    for profile in profiles_enc:
-        if profile["name"] == profile_name:
-            profile["token"] = new_token
-            logger.info(f"Token refreshed for profile {profile_name}")
+    for profiles in (profiles_enc, profiles_plain):
+        profile = next((x for x in profiles if x["name"] == profile_name), None)
+        if profile:
             break
     else:
-        for profile in profiles_plain:
-            if profile["name"] == profile_name:
-                profile["token"] = new_token
-                logger.info(f"Token refreshed for profile {profile_name}")
-                break
-        else:
-            logger.info(f"Failed refreshing token for profile {profile_name}")
-            return False
+        logger.info(f"Failed refreshing token for profile {profile_name}")
+        return False
 
-    if profiles_enc:
-        save_secret(json.dumps({"selected": profile_name, "profiles": profiles_enc}))
-    if profiles_plain:
+    if profile["token"] == new_token:
+        return True
+    profile["token"] = new_token
+    logger.info(f"Token refreshed for profile {profile_name}")
+
+    # save only source containing this profile
+    if profiles is profiles_enc:
+        save_secret(dump_json({"selected": profile_name, "profiles": profiles_enc}))
+    else:
         save_plain({"selected": profile_name, "profiles": profiles_plain}, profiles_path)
 
     return True
@@ -2,11 +2,13 @@
 # Source-available under the Endcord License. See LICENSE for terms.
 # Redistribution of modified versions is not permitted.
 
+import shutil
 from itertools import product
 
 ERROR_CORRECTION = ("L", "M", "Q", "H")
 ERROR_CORRECTION_BITS = (1, 0, 3, 2)
 QR_PAD_BYTES = (236, 17)   # 0xEC and 0x11
+HALF_BLOCKS = (" ", "▄", "▀", "█")   # indexed by top * 2 + bottom
 ALPHA_NUM = b"0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ $%*+-./:"
 PATTERN_POSITION_TABLE = (
     (), (6, 18), (6, 22), (6, 26), (6, 30), (6, 34),
@@ -26,11 +28,15 @@ REED_SOLO_BLOCK_TABLE = (   # L, M, Q, H
 )
 EXP_TABLE = []
 LOG_TABLE = []
+last_qr = (None, None)   # (text, matrix) of last terminal QR code, it is redrawn for same text many times
+last_qr_lines = (None, None)   # ((text, screen_width), rendered lines) of last terminal QR code
 
 
 def init_gf_tables():
     """Initialize Galios Field exp and log tables"""
     global EXP_TABLE, LOG_TABLE
+    if EXP_TABLE:
+        return   # tables are constant, build them only once
     EXP_TABLE = [0] * 256
     LOG_TABLE = [0] * 256
     val = 1
@@ -130,18 +136,19 @@ def generate_qr(data, error_correction="M", border=0):
     else:
         return None
 
-    # find best mask pattern
+    # encode data and do reed-solomon, same stream is used for all masks
+    qr_data = generate_qr_data(version, error_correction, data, binary_mode)
+
+    # find best mask pattern, keeping its qrcode so it is not made again
     min_penalty = 0
-    mask_pattern = 0
+    best_modules = None
     for i in range(8):
-        modules = make_qr(data, version, i, error_correction, binary_mode)
+        modules = make_qr(qr_data, version, i, error_correction)
         penalty = calculate_total_penalty(modules)
         if i == 0 or min_penalty > penalty:
             min_penalty = penalty
-            mask_pattern = i
-
-    # make final qrcode
-    modules = make_qr(data, version, mask_pattern, error_correction, binary_mode)
+            best_modules = modules
+    modules = best_modules
 
     # add border if needed
     if not border:
@@ -154,8 +161,8 @@ def generate_qr(data, error_correction="M", border=0):
     return code
 
 
-def make_qr(data, version, mask_pattern, error_correction, binary_mode):
-    """Make QR code from given configuration"""
+def make_qr(data, version, mask_pattern, error_correction):
+    """Make QR code from encoded data stream and given configuration"""
     modules_count = version * 4 + 17
     modules = [[None] * modules_count for i in range(modules_count)]
 
@@ -221,9 +228,6 @@ def make_qr(data, version, mask_pattern, error_correction, binary_mode):
         for i in range(18):
             modules[i % 3 + modules_count - 8 - 3][i // 3] = ((bits >> i) & 1) == 1
 
-    # encode data and do reed-solomon
-    data = generate_qr_data(version, error_correction, data, binary_mode)
-
     # place data in zigzag traversal loop and apply mask
     def get_bits():   # iterator that yields bool for every bit in data
         for byte in data:
@@ -241,10 +245,7 @@ def make_qr(data, version, mask_pattern, error_correction, binary_mode):
         # traverse the current column pair vertically up and down
         for col_i in (col, col - 1):
             if modules[row][col_i] is None:
-                dark = next(bit_stream)
-                if apply_mask(mask_pattern, row, col_i):
-                    dark = not dark
-                modules[row][col_i] = dark
+                modules[row][col_i] = next(bit_stream) ^ apply_mask(mask_pattern, row, col_i)
         row += direction
         # if hit the boundary - shift left and go back
         if row < 0 or row >= modules_count:
@@ -286,10 +287,10 @@ def generate_qr_data(version, error_correction, data, binary_mode):
         bit_string += "0" * (8 - (len(bit_string) % 8))
 
     # fill remaining space with alternating qr padding bytes
-    pad_index = 0
-    while len(bit_string) < bit_limit:
-        bit_string += bit_str(QR_PAD_BYTES[pad_index % 2], 8)
-        pad_index += 1
+    missing = bit_limit - len(bit_string)
+    if missing > 0:
+        pad_bits = "".join(bit_str(byte, 8) for byte in QR_PAD_BYTES)
+        bit_string += (pad_bits * (missing // len(pad_bits) + 1))[:missing]
 
     # convert to list of byte integers
     data_bytes = [int(bit_string[i:i+8], 2) for i in range(0, len(bit_string), 8)]
@@ -349,13 +350,11 @@ def calculate_total_penalty(modules):
     """Calculate total penalty value from all 4 QR penalty rules"""
     modules_count = len(modules)
     penalty = 0
+    columns = [list(column) for column in zip(*modules)]   # transposed once, used by rules 1 and 3
 
     # rule 1 - check horizontal and vertical lines for consecutive modules
-    for row in modules:
-        penalty += calculate_line_penalty(row)
-    for col_idx in range(modules_count):
-        column = [modules[row_idx][col_idx] for row_idx in range(modules_count)]
-        penalty += calculate_line_penalty(column)
+    for line in modules + columns:
+        penalty += calculate_line_penalty(line)
 
     # rule 2 - 2x2 blocks of same value
     for row in range(modules_count - 1):
@@ -368,14 +367,9 @@ def calculate_total_penalty(modules):
     # rule 3 - sequences that look like finder pattern
     pattern_1 = [True, False, True, True, True, False, True, False, False, False, False]
     pattern_2 = [False, False, False, False, True, False, True, True, True, False, True]
-    for row in modules:
+    for line in modules + columns:
         for c in range(modules_count - 10):
-            check = row[c : c + 11]
-            if check == pattern_1 or check == pattern_2:
-                penalty += 40
-    for c in range(modules_count):
-        for r in range(modules_count - 10):
-            check = [modules[r + i][c] for i in range(11)]
+            check = line[c : c + 11]
             if check == pattern_1 or check == pattern_2:
                 penalty += 40
 
@@ -406,17 +400,47 @@ def calculate_line_penalty(line):
     return penalty
 
 
-def gen_qr_terminal_string(text, text_above="", text_bellow=""):
-    """Convert string to QR code string ready to be printed to terminal and check for terminal size"""
-    import shutil
+def render_qr_lines(matrix, screen_width):
+    """Render QR code matrix into lines of half-blocks, centered in screen width"""
+    bg_black = "\x1b[48;5;16m"
+    reset = "\x1b[0m"
+    height = len(matrix)
+    width = len(matrix[0])
+    padding_w = (screen_width - width) // 2
+    visible_len = padding_w + width
+
+    # padding is same for all lines
+    left_padding = bg_black + (" " * padding_w) if padding_w > 0 else ""
+    right_padding = bg_black + (" " * (screen_width - visible_len)) if visible_len < screen_width else ""
+    right_padding += reset
+
+    lines = []
+    for y in range(0, height, 2):
+        top_line = matrix[y]
+        bottom_line = matrix[y + 1] if y + 1 < height else [False] * width
+        qr_line = "".join([HALF_BLOCKS[top * 2 + bottom] for top, bottom in zip(top_line, bottom_line)])
+        lines.append(left_padding + qr_line + right_padding)
+    return lines
+
+
+def gen_qr_terminal_string(text, text_above="", text_bellow="", term_size=None):
+    """
+    Convert string to QR code string ready to be printed to terminal and check for terminal size.
+    term_size can be passed if caller already has it, to avoid querying it again.
+    """
     fg_white = "\x1b[38;5;15m"
     bg_black = "\x1b[48;5;16m"
     reset = "\x1b[0m"
-    matrix = generate_qr(text)
+    global last_qr, last_qr_lines
+    if last_qr[0] == text:
+        matrix = last_qr[1]
+    else:
+        matrix = generate_qr(text)
+        last_qr = (text, matrix)
 
     height = len(matrix)
     width = len(matrix[0])
-    term = shutil.get_terminal_size()
+    term = term_size or shutil.get_terminal_size()
     screen_height = term.lines
     screen_width = term.columns
 
@@ -436,45 +460,21 @@ def gen_qr_terminal_string(text, text_above="", text_bellow=""):
 
     # calculate padding
     padding_h = (screen_height - height // 2) // 2
-    padding_w = (screen_width - width) // 2
 
     # top padding
-    for _ in range(padding_h):
-        out_lines.append(bg_black + (" " * screen_width) + reset)
+    empty_line = bg_black + (" " * screen_width) + reset
+    out_lines.extend([empty_line] * padding_h)
 
-    for y in range(0, height, 2):
-        top_line = matrix[y]
-        bottom_line = matrix[y + 1] if y + 1 < height else [False] * width
-        line_parts = []
-
-        # left padding
-        if padding_w > 0:
-            line_parts.append(bg_black + (" " * padding_w))
-
-        # qr code
-        for x in range(width):
-            top = top_line[x]
-            bottom = bottom_line[x]
-            if top and bottom:
-                line_parts.append("█")
-            elif top and not bottom:
-                line_parts.append("▀")
-            elif not top and bottom:
-                line_parts.append("▄")
-            else:
-                line_parts.append(" ")
-
-        # right padding
-        visible_len = padding_w + width
-        if visible_len < screen_width:
-            line_parts.append(bg_black + (" " * (screen_width - visible_len)))
-
-        line_parts.append(reset)
-        out_lines.append("".join(line_parts))
+    # qr code lines depend only on text and width, so they are reused when only text around them changes
+    if last_qr_lines[0] == (text, screen_width):
+        qr_lines = last_qr_lines[1]
+    else:
+        qr_lines = render_qr_lines(matrix, screen_width)
+        last_qr_lines = ((text, screen_width), qr_lines)
+    out_lines.extend(qr_lines)
 
     # bottom padding
-    while len(out_lines) < screen_height + 1:
-        out_lines.append(bg_black + (" " * screen_width) + reset)
+    out_lines.extend([empty_line] * (screen_height + 1 - len(out_lines)))
 
     out_lines.append(bg_black + fg_white + "\n".join(text_bellow) + reset)
 
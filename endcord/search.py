@@ -248,6 +248,39 @@ def search_usernames_roles(roles, query_results, guild_id, gateway, query, prese
     return sorted(results, key=lambda x: x[2], reverse=True)
 
 
+standard_emojis_cache = [None, []]   # [source emoji data, entries]
+
+
+def get_standard_emojis():
+    """
+    Get list of standard emoji entries prepared for searching: (emoji, emoji_name, long_name, name_suffix).
+    Skin tone variations are skipped. Computed only once for loaded emoji data.
+    """
+    if standard_emojis_cache[0] is utils.EMOJI_DATA:
+        return standard_emojis_cache[1]
+    entries = []
+    for key, data in utils.EMOJI_DATA.items():
+        # utils.EMOJI_DATA = {emoji: {":emoji_name:", ":alias:"}...}
+        if any((0x1F3FB <= ord(ch) <= 0x1F3FF) for ch in key):
+            continue   # skip variation emoji
+        if len(data) > 1:
+            if len(data[1]) < len(data[0]):
+                emoji_name = data[1]
+                long_name = data[0]
+            else:
+                emoji_name = data[0]
+                long_name = data[1]
+            name_suffix = f" - {emoji_name} ({long_name})"
+        else:
+            emoji_name = data[0]
+            long_name = None
+            name_suffix = " - " + data[0]
+        entries.append((key, emoji_name, long_name, name_suffix))
+    standard_emojis_cache[0] = utils.EMOJI_DATA
+    standard_emojis_cache[1] = entries
+    return entries
+
+
 def search_emojis(all_emojis, favorite_emojis, local_emojis, premium, guild_id, query, safe_emoji=False, limit=50, score_cutoff=15):
     """Search for emoji"""
     results = []
@@ -285,11 +318,10 @@ def search_emojis(all_emojis, favorite_emojis, local_emojis, premium, guild_id,
                 heapq.heappush(results, (formatted, f"<:{guild_emoji["name"]}:{guild_emoji["id"]}>", score + 1000))
         except ValueError:
             emoji_string = f":{emoji_name}:"
-            for emoji, data in utils.EMOJI_DATA.items():
-                if emoji_string in data:
-                    break
-            else:
+            emoji = utils.EMOJI_SHORTCODES.get(emoji_string)
+            if not emoji:
                 continue
+            data = utils.EMOJI_DATA[emoji]
             formatted = "** "
             if not safe_emoji:
                 formatted += emoji
@@ -326,25 +358,7 @@ def search_emojis(all_emojis, favorite_emojis, local_emojis, premium, guild_id,
 
     # standard emoji
     if len(results) < limit:
-        for key, data in utils.EMOJI_DATA.items():
-            # utils.EMOJI_DATA = {emoji: {":emoji_name:", ":alias:"}...}
-            if any((0x1F3FB <= ord(ch) <= 0x1F3FF) for ch in key):
-                continue   # skip variation emoji
-            formatted = " "
-            if not safe_emoji:
-                formatted += str(key)
-            if len(data) > 1:
-                if len(data[1]) < len(data[0]):
-                    emoji_name = data[1]
-                    long_name = data[0]
-                else:
-                    emoji_name = data[0]
-                    long_name = data[1]
-                formatted += f" - {emoji_name} ({long_name})"
-            else:
-                emoji_name = data[0]
-                long_name = None
-                formatted += " - " + data[0]
+        for emoji, emoji_name, long_name, name_suffix in get_standard_emojis():
             score = fuzzy_match_score(query, emoji_name)
             if long_name:
                 score_long = fuzzy_match_score(query, long_name)
@@ -353,6 +367,7 @@ def search_emojis(all_emojis, favorite_emojis, local_emojis, premium, guild_id,
                 score -= emoji_name.count("_")
             if score < worst_score:
                 continue
+            formatted = f" {name_suffix}" if safe_emoji else f" {emoji}{name_suffix}"
             heapq.heappush(results, (formatted, emoji_name, score))
             if len(results) > limit:
                 heapq.heappop(results)
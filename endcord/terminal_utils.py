@@ -19,11 +19,11 @@ if sys.platform == "win32":
     kernel32.GetConsoleMode(H_STDIN, ctypes.byref(OLD_IN_MODE))
     kernel32.GetConsoleMode(H_STDOUT, ctypes.byref(OLD_OUT_MODE))
 else:
-    import fcntl
     import select
     import termios
     import tty
     STDIN_FD = sys.stdin.fileno()
+    STDOUT_FD = sys.stdout.fileno()
     OLD_TERM = termios.tcgetattr(STDIN_FD)
 
 
@@ -41,6 +41,8 @@ KEY_CODES = {
     b"\n": "ENTER",
 }
 
+KEY_CODES_MAX_LEN = max(len(code) for code in KEY_CODES)
+
 KEY_CODES_WIN = {
     b"H": "UP",
     b"P": "DOWN",
@@ -49,6 +51,20 @@ KEY_CODES_WIN = {
     b"S": "DELETE",
 }
 
+ENTER_TUI_SEQ = (
+    b"\x1b[?1049h"   # alternate screen
+    b"\x1b[?7l"      # disable line wrap
+    b"\x1b[2J"       # clear screen
+    b"\x1b[?25l"     # hide cursor
+    b"\x1b[H"        # cursor home
+)
+LEAVE_TUI_SEQ = (
+    b"\x1b[?1049l"   # leave alternate screen
+    b"\x1b[?7h"      # enable line wrap
+    b"\x1b[?25h"     # show cursor
+    b"\x1b[0m"       # reset attrs
+)
+
 width = 0
 height = 0
 run_esc_detector = False
@@ -57,25 +73,14 @@ run_esc_detector = False
 def enter_tui():
     """Enter tui terminal mode"""
     tty.setcbreak(STDIN_FD)
-    sys.stdout.write(
-        "\x1b[?1049h"   # alternate screen
-        "\x1b[?7l"      # disable line wrap
-        "\x1b[2J"       # clear screen
-        "\x1b[?25l"     # hide cursor
-        "\x1b[H",       # cursor home
-    )
-    sys.stdout.flush()
+    sys.stdout.flush()   # anything already buffered goes before mode change
+    os.write(STDOUT_FD, ENTER_TUI_SEQ)
 
 
 def leave_tui():
     """Leave tui terminal mode"""
-    sys.stdout.write(
-        "\x1b[?1049l"   # leave alternate screen
-        "\x1b[?7h"      # enable line wrap
-        "\x1b[?25h"     # show cursor
-        "\x1b[0m",      # reset attrs
-    )
     sys.stdout.flush()
+    os.write(STDOUT_FD, LEAVE_TUI_SEQ)
     termios.tcsetattr(STDIN_FD, termios.TCSADRAIN, OLD_TERM)
 
 
@@ -86,41 +91,39 @@ def enter_tui_win():
     kernel32.SetConsoleMode(H_STDIN, OLD_IN_MODE.value | 0x0200 | 0x0001)
     # enable ansi escape processing
     kernel32.SetConsoleMode(H_STDOUT, OLD_OUT_MODE.value | 0x0004)
-    sys.stdout.write(
-    "\x1b[?1049h"   # alternate screen
-    "\x1b[?7l"      # disable line wrap
-    "\x1b[2J"       # clear screen
-    "\x1b[?25l"     # hide cursor
-    "\x1b[H",       # cursor home
-    )
     sys.stdout.flush()
+    sys.stdout.buffer.write(ENTER_TUI_SEQ)
+    sys.stdout.buffer.flush()
 
 
 def leave_tui_win():
     """Leave tui terminal mode"""
-    sys.stdout.write(
-    "\x1b[?1049l"   # leave alternate screen
-    "\x1b[?7h"      # enable wrap
-    "\x1b[?25h"     # show cursor
-    "\x1b[0m",      # reset attrs
-    )
     sys.stdout.flush()
+    sys.stdout.buffer.write(LEAVE_TUI_SEQ)
+    sys.stdout.buffer.flush()
     kernel32.SetConsoleMode(H_STDIN, OLD_IN_MODE)
     kernel32.SetConsoleMode(H_STDOUT, OLD_OUT_MODE)
 
 
 def get_size():
     """Get size of terminal in characters (h, w)"""
-    size = shutil.get_terminal_size()
+    try:
+        size = os.get_terminal_size()   # called every frame, skip shutil env var checks
+        if size.lines and size.columns:
+            return size.lines, size.columns
+    except OSError:   # stdout is not a terminal
+        pass
+    size = shutil.get_terminal_size()   # handles env vars and fallback size
     return size.lines, size.columns
 
 
-def draw(lines):
-    """Draw lines on screen"""
+def draw(*parts):
+    """Draw lines on screen, all parts are written one after another and flushed once"""
+    # write whole frame as bytes, text layer is line buffered and would flush on every newline
+    data = ("\x1b[H" + "".join(parts)).encode("utf-8", "replace")   # cursor home
     try:
-        sys.stdout.write("\x1b[H")   # cursor home
-        sys.stdout.write(lines)
-        sys.stdout.flush()
+        sys.stdout.buffer.write(data)
+        sys.stdout.buffer.flush()
     except BlockingIOError:
         pass
 
@@ -135,6 +138,23 @@ def draw_over_curses(text, y, x):
     sys.stdout.flush()
 
 
+def sequence_complete(seq):
+    """Check if escape sequence is complete, so unknown keys dont have to wait for timeout"""
+    second = seq[1]
+    if second == 0x5B:   # CSI "[" - ends with final byte in range 0x40-0x7E
+        if len(seq) < 3:
+            return False
+        third = seq[2]
+        if third == 0x5B:   # linux console F1-F5 "ESC [ [ x"
+            return len(seq) > 3
+        if third == 0x4D:   # X10 mouse report "ESC [ M" + 3 bytes
+            return len(seq) > 5
+        return 0x40 <= seq[-1] <= 0x7E
+    if second == 0x4F:   # SS3 "O" - single byte after it
+        return len(seq) > 2
+    return True   # alt + key
+
+
 def read_key():
     """Blocking read key, return key code like curses.getch(), alt sequences are not handled"""
     fd = sys.stdin.fileno()
@@ -159,10 +179,10 @@ def read_key():
             return first
 
     # escape sequences
-    seq = first
-    start = time.time()
+    seq = bytearray(first)   # appended in place, long sequences like mouse reports can be up to 32 bytes
+    deadline = time.monotonic() + 0.01
     while True:
-        time_left = 0.01 - (time.time() - start)
+        time_left = deadline - time.monotonic()
         if time_left <= 0:
             break
         ready, _, _ = select.select([fd], [], [], time_left)
@@ -172,9 +192,11 @@ def read_key():
                 if not byte:
                     continue
                 seq += byte
-                if seq in KEY_CODES:
-                    return KEY_CODES[seq]
-                if len(seq) > 6:
+                if len(seq) <= KEY_CODES_MAX_LEN:   # longer sequences cant be in KEY_CODES
+                    key = KEY_CODES.get(bytes(seq))
+                    if key:
+                        return key
+                if len(seq) > 32 or sequence_complete(seq):   # limit for garbage input
                     break
             except (IOError, OSError):
                 break
@@ -184,7 +206,7 @@ def read_key():
     if seq == b"\x1b":
         return "ESC"
 
-    return repr(seq)
+    return repr(bytes(seq))
 
 
 def read_key_win():
@@ -263,24 +285,16 @@ def query_terminal(query, timeout=0.1, read_bytes=1024):
         return None
     stdin_fd = sys.stdin.fileno()
     old_term = termios.tcgetattr(stdin_fd)
-    old_flags = fcntl.fcntl(stdin_fd, fcntl.F_GETFL)
     response = b""
     try:
         tty.setraw(stdin_fd)
-        fcntl.fcntl(stdin_fd, fcntl.F_SETFL, old_flags | os.O_NONBLOCK)
         os.write(stdin_fd, query)
-        while timeout > 0:
-            try:
-                response = os.read(stdin_fd, read_bytes)
-                if response:
-                    break
-            except BlockingIOError:
-                pass
-            timeout -= 0.01
-            time.sleep(0.01)
+        # wake up as soon as response arrives instead of polling
+        ready, _, _ = select.select([stdin_fd], [], [], timeout)
+        if ready:
+            response = os.read(stdin_fd, read_bytes)
     finally:
         termios.tcsetattr(stdin_fd, termios.TCSADRAIN, old_term)
-        fcntl.fcntl(stdin_fd, fcntl.F_SETFL, old_flags)
     return response.decode()
 
 
@@ -13,6 +13,7 @@ import shutil
 import subprocess
 import sys
 import time
+from itertools import chain
 
 from endcord import minimagic, peripherals
 
@@ -25,7 +26,10 @@ if "bsd" in sys.platform:
 logger = logging.getLogger(__name__)
 match_youtube = re.compile(r"(?:https?:\/\/)?(?:www\.)?(?:youtube\.com\/(?:watch\?v=|embed\/|shorts\/)|youtu\.be\/)[a-zA-Z0-9_-]{11}")
 match_emoji = re.compile(r"(?<!\\):[^:\s]+:")
+match_not_printable_ascii = re.compile(r"[^\x20-\x7E]")
 EMOJI_DATA = {}   # delayed load for faster startup
+EMOJI_SHORTCODES = {}   # reverse EMOJI_DATA map: {":emoji_name:": emoji}
+EMOJI_NAMES = {}   # shortest shortcode for each emoji: {emoji: ":emoji_name:"}
 
 
 def get_executable():
@@ -447,55 +451,64 @@ def get_base_path():
 
 def load_emoji(path="emoji.json"):
     """Load global emoji data"""
-    global EMOJI_DATA
+    global EMOJI_DATA, EMOJI_SHORTCODES, EMOJI_NAMES
     path = os.path.join(get_base_path(), *path.split("/"))
     if not os.path.exists(path):
         return
     with open(path, "r", encoding="utf-8") as f:
         EMOJI_DATA = json.load(f)
+    EMOJI_SHORTCODES = {}
+    EMOJI_NAMES = {}
+    for emoji, shortcodes in EMOJI_DATA.items():
+        for shortcode in shortcodes:
+            EMOJI_SHORTCODES.setdefault(shortcode, emoji)
+        EMOJI_NAMES[emoji] = min(shortcodes, key=len)
 
 
 def emojize(text):
     """Convert all emoji shortcodes in given string to actual emoji"""
-    if not text:
+    if not text or ":" not in text:
         return text
 
     def replace_emoji(match):
         name = match.group()
-        for emoji, data in EMOJI_DATA.items():
-            if name in data:
-                break
-        else:
+        emoji = EMOJI_SHORTCODES.get(name)
+        if not emoji:
             return name
         # remove existing variation selector and force emoji
-        if emoji[-1] == 0xFE0E or emoji[-1] == 0xFE0F:
-            return emoji[0:-1] + 0xFE0F
+        if emoji[-1] == "\uFE0E" or emoji[-1] == "\uFE0F":
+            return emoji[0:-1] + "\uFE0F"
         return emoji
 
-    return re.sub(match_emoji, replace_emoji, text)
+    return match_emoji.sub(replace_emoji, text)
+
+
+POTENTIAL_EMOJI_CHARS = frozenset(map(chr, chain(
+    range(0x1F300, 0x1FA00),
+    range(0x2600, 0x27C0),
+    range(0x2300, 0x2400),
+    range(0x2B00, 0x2C00),
+)))
 
 
 def is_potential_emoji(cluster):
-    """Check if any character in the cluster is emoji"""
-    for character in cluster:
-        ch = ord(character)
-        return (
-            (0x1F300 <= ch <= 0x1F9FF) or
-            (0x2600 <= ch <= 0x27BF) or
-            (0x2300 <= ch <= 0x23FF) or
-            (0x2B00 <= ch <= 0x2BFF)
-        )
-    return False
+    """Check if first character in the cluster is emoji"""
+    return bool(cluster) and cluster[0] in POTENTIAL_EMOJI_CHARS
 
 
-SKIN_TONES = {0x1F3FB, 0x1F3FC, 0x1F3FD, 0x1F3FE, 0x1F3FF}
+SKIN_TONES = frozenset((0x1F3FB, 0x1F3FC, 0x1F3FD, 0x1F3FE, 0x1F3FF))
+DEMOJIZE_SEPARATOR = "\uEE43"   # character from private use area
+CLUSTER_CONTINUATIONS = frozenset(("\uFE0E", "\uFE0F", "\u20E3", "\u200D", *map(chr, SKIN_TONES)))
 
 
 def next_emoji_cluster(text, i):
     """Get emoji cluster after specific index"""
     ch = text[i]
-    cluster = [ch]
     i += 1
+    # fast path for most common case: single non-flag character
+    if (i == len(text) or text[i] not in CLUSTER_CONTINUATIONS) and not 0x1F1E6 <= ord(ch) <= 0x1F1FF:
+        return ch, i
+    cluster = [ch]
 
     if 0x1F1E6 <= ord(ch) <= 0x1F1FF:   # flags
         if i < len(text) and 0x1F1E6 <= ord(text[i]) <= 0x1F1FF:
@@ -529,20 +542,28 @@ def next_emoji_cluster(text, i):
 
 def demojize(text, safe=False):
     """Convert all emojis in given string to their shortcodes"""
+    if text.isascii():   # there are no ascii emoji
+        return text
     result = []
+    # bind lookups used for each character only once per call
+    search_not_ascii = match_not_printable_ascii.search
+    get_emoji_name = EMOJI_NAMES.get
+    text_len = len(text)
     i = 0
-    while i < len(text):
-        ch = text[i]
-        if 0x20 <= ord(ch) < 0x7F:
-            result.append(ch)
-            i += 1
-            continue
-        cluster, i = next_emoji_cluster(text, i)
-        if ord(cluster[-1]) == 0xFE0E or ord(cluster[-1]) == 0xFE0F:
+    while i < text_len:
+        match = search_not_ascii(text, i)   # skip whole printable ascii runs at once
+        if not match:
+            result.append(text[i:])
+            break
+        start = match.start()
+        if start > i:
+            result.append(text[i:start])
+        cluster, i = next_emoji_cluster(text, start)
+        if cluster[-1] == "\uFE0E" or cluster[-1] == "\uFE0F":
             cluster = cluster[0:-1]   # remove variation selector for for text/emoji
-        emoji = EMOJI_DATA.get(cluster)
-        if emoji:
-            result.append(min(emoji, key=len))
+        emoji_name = get_emoji_name(cluster)
+        if emoji_name:
+            result.append(emoji_name)
         elif safe and is_potential_emoji(cluster):
             result.append("▒")
         else:
@@ -550,9 +571,20 @@ def demojize(text, safe=False):
     return "".join(result)
 
 
+def demojize_many(texts, safe=False):
+    """Convert all emojis in each string in the list to their shortcodes, in one demojize pass"""
+    if not texts:
+        return []
+    joined = DEMOJIZE_SEPARATOR.join(texts)
+    # zwj at the end or continuation at the start would merge separator into a cluster
+    if joined.count(DEMOJIZE_SEPARATOR) != len(texts) - 1 or any(text.endswith("\u200D") or text[:1] in CLUSTER_CONTINUATIONS for text in texts):
+        return [demojize(text, safe) for text in texts]
+    return demojize(joined, safe).split(DEMOJIZE_SEPARATOR)
+
+
 def is_emoji(character):
     """Check if given character is emoji"""
-    if not character:
+    if not character or character.isascii():
         return False
     return character in EMOJI_DATA
 
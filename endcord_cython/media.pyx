@@ -11,6 +11,7 @@ cdef str BG_PREFIX = ESC + "[48;2;"
 cdef str FG_PREFIX_ANSI = ESC + "[38;5;"
 cdef str BG_PREFIX_ANSI = ESC + "[48;5;"
 cdef const char* RESET_NL = "\x1b[0m\n"   # need it as bytes
+cdef list FG_ANSI = [FG_PREFIX_ANSI + str(i) + "m" for i in range(256)]   # precomputed 256-color sequences
 
 
 cpdef img_to_term(
@@ -53,9 +54,7 @@ cpdef img_to_term(
             gray_val = pixels_gray[x, y]
             color = pixels[x, y] + 16
             if color != current_fg:
-                line_parts.append(FG_PREFIX_ANSI)   # avoiding string concatenations for speed
-                line_parts.append(str(color))
-                line_parts.append("m")
+                line_parts.append(FG_ANSI[color])
                 current_fg = color
             line_parts.append(ascii_palette[(gray_val * ascii_palette_len) // 255])
 
@@ -75,70 +74,6 @@ cpdef img_to_term(
     return "\n".join(out_lines)
 
 
-cpdef img_to_term_block(
-    bytes buf,
-    int bg_color,
-    int screen_width,
-    int screen_height,
-    int img_width,
-    int img_height
-):
-    cdef const unsigned char* data = <const unsigned char*>buf
-    cdef int padding_h = (screen_height - img_height // 2) // 2
-    cdef int padding_w = (screen_width - img_width) // 2
-    cdef int x, y, top_color, bot_color, current_fg, current_bg, visible_len
-
-    cdef str BGR = ESC + "[48;5;" + str(bg_color) + "m"
-    cdef str blank_line = BGR + (" " * screen_width) + RESET
-    cdef list line_parts
-    cdef list out_lines = []
-
-    # top padding
-    for y in range(padding_h):
-        out_lines.append(blank_line)
-
-    # image rows
-    for y in range(0, img_height - 1, 2):
-        line_parts = []
-        current_fg = -1
-        current_bg = -1
-
-        # left padding
-        if padding_w > 0:
-            line_parts.append(BGR)
-            line_parts.append(" " * padding_w)
-
-        for x in range(img_width):
-            top_color = data[y * img_width + x] + 16
-            bot_color = data[(y + 1) * img_width + x] + 16
-            if top_color != current_fg:
-                line_parts.append(FG_PREFIX_ANSI)   # avoiding string concatenations for speed
-                line_parts.append(str(top_color))
-                line_parts.append("m")
-                current_fg = top_color
-            if bot_color != current_bg:
-                line_parts.append(BG_PREFIX_ANSI)
-                line_parts.append(str(bot_color))
-                line_parts.append("m")
-                current_bg = bot_color
-            line_parts.append("▀")
-
-        # right padding
-        visible_len = padding_w + img_width
-        if visible_len < screen_width:
-            line_parts.append(BGR)
-            line_parts.append(" " * (screen_width - visible_len))
-
-        line_parts.append(RESET)
-        out_lines.append("".join(line_parts))
-
-    # bottom padding
-    while len(out_lines) < screen_height:
-        out_lines.append(blank_line)
-
-    return "\n".join(out_lines)
-
-
 # ~3x faster than bellow commented function
 # this is using only C, removing all python overhead
 
@@ -165,6 +100,111 @@ cdef inline void append_color_channel(char** cursor_ptr, unsigned char channel_v
     cursor_ptr[0] = cursor   # back to pointer ref
 
 
+cpdef str img_to_term_block(
+    bytes buf,
+    int bg_color,
+    int screen_width,
+    int screen_height,
+    int img_width,
+    int img_height
+):
+    cdef const unsigned char* data = <const unsigned char*>buf
+    cdef int padding_h = (screen_height - img_height // 2) // 2
+    cdef int padding_w = (screen_width - img_width) // 2
+    cdef int right_pad_len = screen_width - padding_w - img_width
+    cdef int x, y, row_top
+    cdef unsigned char top_color, bot_color
+    cdef int current_fg, current_bg
+    cdef int current_lines
+    cdef bytes raw_bytes
+    cdef str result
+
+    # pre allocate c buffer
+    cdef size_t max_buf_size = (img_width * img_height * 15) + (screen_width * screen_height * 2) + 8192
+    cdef char* c_buf = <char*>malloc(max_buf_size)
+    cdef char* cursor = c_buf
+
+    # prepare terminal background sequence
+    cdef char bgr_seq[32]
+    cdef int bgr_len = sprintf(bgr_seq, "\x1b[48;5;%dm", bg_color)
+
+    # drawing without gil lets decoding and audio threads run meanwhile
+    with nogil:
+        # top padding
+        for y in range(padding_h):
+            memcpy(cursor, bgr_seq, bgr_len)
+            cursor += bgr_len
+            for x in range(screen_width):
+                cursor[0] = b" "
+                cursor += 1
+            memcpy(cursor, RESET_NL, 5)
+            cursor += 5
+
+        # image rows
+        for y in range(0, img_height - 1, 2):
+            current_fg = -1
+            current_bg = -1
+
+            # Left padding
+            if padding_w > 0:
+                memcpy(cursor, bgr_seq, bgr_len)
+                cursor += bgr_len
+                for x in range(padding_w):
+                    cursor[0] = b" "
+                    cursor += 1
+
+            row_top = y * img_width
+            for x in range(img_width):
+                top_color = data[row_top + x] + 16
+                bot_color = data[row_top + img_width + x] + 16
+                if top_color != current_fg:
+                    memcpy(cursor, "\x1b[38;5;", 7)
+                    cursor += 7
+                    append_color_channel(&cursor, top_color, "m")
+                    current_fg = top_color
+                if bot_color != current_bg:
+                    memcpy(cursor, "\x1b[48;5;", 7)
+                    cursor += 7
+                    append_color_channel(&cursor, bot_color, "m")
+                    current_bg = bot_color
+                # block character (▀)
+                cursor[0] = <char>0xe2
+                cursor[1] = <char>0x96
+                cursor[2] = <char>0x80
+                cursor += 3
+
+            # right padding
+            if right_pad_len > 0:
+                memcpy(cursor, bgr_seq, bgr_len)
+                cursor += bgr_len
+                for x in range(right_pad_len):
+                    cursor[0] = b" "
+                    cursor += 1
+
+            memcpy(cursor, RESET_NL, 5)
+            cursor += 5
+
+        # bottom padding
+        current_lines = max(padding_h, 0) + (img_height // 2)
+        while current_lines < screen_height:
+            memcpy(cursor, bgr_seq, bgr_len)
+            cursor += bgr_len
+            for x in range(screen_width):
+                cursor[0] = b" "
+                cursor += 1
+            memcpy(cursor, RESET_NL, 5)
+            cursor += 5
+            current_lines += 1
+
+    # convert to python string
+    if cursor > c_buf and (cursor - 1)[0] == b"\n":
+        cursor -= 1
+    raw_bytes = c_buf[:cursor - c_buf]
+    result = raw_bytes.decode("utf-8", errors="replace")
+    free(c_buf)
+    return result
+
+
 cpdef str img_to_term_block_truecolor(
     bytes buf,
     int bg_color,
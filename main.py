@@ -93,8 +93,9 @@ def main(args):
     keybindings = config.normalize_keybindings(keybindings)
 
     os.environ["ESCDELAY"] = "25"   # 25ms
-    if os.environ.get("TERM", "") == "linux" or os.environ.get("TERM", "").startswith("xterm"):   # for xterm-ghostty
-        os.environ["REALTERM"] = os.environ["TERM"]
+    term = os.environ.get("TERM", "")
+    if term == "linux" or term.startswith("xterm"):   # for xterm-ghostty
+        os.environ["REALTERM"] = term
         os.environ["TERM"] = "xterm-256color"   # try to force 256-color mode
     utils.ensure_ssl_certificates()
 